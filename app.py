@@ -6,9 +6,8 @@ Provides UI controls and displays simulation results.
 import streamlit as st
 import threading
 import time
-import json
 import queue
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Callable, List, Optional
 from datetime import datetime
 
 # Import simulation API
@@ -23,12 +22,15 @@ except ImportError:
 # Import UI helpers
 try:
     from ui.block_renderer import render_blocks
+    from ui.helpers import clear_render_caches
 except ImportError:
     # Fallback if helpers don't exist yet
     def render_block_card(block: dict) -> str:
         return f"<div>Block #{block.get('height', '?')}</div>"
     def render_blocks(blocks: list) -> str:
         return "<div>No blocks</div>"
+    def clear_render_caches() -> None:
+        pass
 
 # Initialize session state
 if 'events' not in st.session_state:
@@ -40,14 +42,24 @@ if 'event_queue' not in st.session_state:
 if 'miner_rates' not in st.session_state:
     st.session_state['miner_rates'] = {}
 
-def ui_callback(event: Dict[str, Any]) -> None:
+def make_ui_callback(event_queue: queue.Queue) -> Callable[[List[Dict[str, Any]]], None]:
     """
-    Thread-safe callback function to handle simulation events.
-    Called from mining threads - uses queue instead of direct session_state access.
+    Build the callback that hands batches of simulation events to this session.
+    
+    The callback runs on the simulation's flusher thread, which has no script
+    run context (st.session_state there is an empty stand-in), so it captures
+    the session's queue object instead of looking it up.
+    
+    Args:
+        event_queue: This session's event queue, drained by process_event_queue
+    
+    Returns:
+        Thread-safe callback to pass to start_simulation
     """
-    # Use queue for thread-safe communication
-    if 'event_queue' in st.session_state:
-        st.session_state['event_queue'].put(event)
+    def ui_callback(events: List[Dict[str, Any]]) -> None:
+        for event in events:
+            event_queue.put(event)
+    return ui_callback
 
 def process_event_queue():
     """Process events from the queue into session state."""
@@ -62,9 +74,21 @@ def process_event_queue():
     except queue.Empty:
         pass
 
+def fetch_stats() -> Optional[Dict[str, Any]]:
+    """Fetch simulation stats, or None if the sim API is unavailable or fails."""
+    if not SIM_API_AVAILABLE:
+        return None
+    try:
+        return get_stats()
+    except Exception:
+        return None
+
 # Ensure we process any queued events early so metrics and logs reflect latest state
 process_event_queue()
 
+# One stats snapshot per script run; get_stats rebuilds the fork tree each call
+stats = fetch_stats()
+
 def _render_2d_blocks(fork_tree: Dict[str, Any]) -> str:
     """
     Render blocks in a simple blockchain explorer style with connections.
@@ -100,17 +124,18 @@ def _render_2d_blocks(fork_tree: Dict[str, Any]) -> str:
     
     levels = get_level_blocks(genesis)
     
-    html = '<div style="background: #f8f9fa; padding: 20px; border-radius: 8px; overflow-x: auto;">'
-    html += '<div style="margin-bottom: 10px; font-size: 12px;">'
-    html += '<span style="background: #1e90ff; color: white; padding: 4px 8px; border-radius: 4px; margin-right: 10px;">■ Main Chain</span>'
-    html += '<span style="background: #ff8c00; color: white; padding: 4px 8px; border-radius: 4px;">■ Stale/Fork</span>'
-    html += '</div>'
+    # Collect fragments and join once at the end
+    parts = ['<div style="background: #f8f9fa; padding: 20px; border-radius: 8px; overflow-x: auto;">']
+    parts.append('<div style="margin-bottom: 10px; font-size: 12px;">')
+    parts.append('<span style="background: #1e90ff; color: white; padding: 4px 8px; border-radius: 4px; margin-right: 10px;">■ Main Chain</span>')
+    parts.append('<span style="background: #ff8c00; color: white; padding: 4px 8px; border-radius: 4px;">■ Stale/Fork</span>')
+    parts.append('</div>')
     
     # Draw each height level horizontally
     for height in sorted(levels.keys()):
         blocks = levels[height]
         
-        html += '<div style="display: flex; gap: 20px; margin-bottom: 30px; align-items: center; flex-wrap: wrap;">'
+        parts.append('<div style="display: flex; gap: 20px; margin-bottom: 30px; align-items: center; flex-wrap: wrap;">')
         
         for idx, block in enumerate(blocks):
             is_main = block.get('is_main', False)
@@ -131,7 +156,7 @@ def _render_2d_blocks(fork_tree: Dict[str, Any]) -> str:
                 label = '✗ STALE'
             
             # Block card
-            html += f'''
+            parts.append(f'''
             <div style="
                 background: {bg};
                 color: {text_color};
@@ -148,17 +173,17 @@ def _render_2d_blocks(fork_tree: Dict[str, Any]) -> str:
                 <div style="font-size: 10px; margin-top: 4px;">{block_hash}</div>
                 <div style="font-size: 9px; opacity: 0.7; margin-top: 2px;">{miner_id}</div>
             </div>
-            '''
+            ''')
             
             # Add arrow between blocks (except last in row)
             if idx < len(blocks) - 1:
-                html += '<div style="font-size: 20px; opacity: 0.5; margin: 0 10px;">→</div>'
+                parts.append('<div style="font-size: 20px; opacity: 0.5; margin: 0 10px;">→</div>')
         
-        html += '</div>'
+        parts.append('</div>')
     
-    html += '</div>'
+    parts.append('</div>')
     
-    return html
+    return ''.join(parts)
 
 # Page configuration
 st.set_page_config(
@@ -192,13 +217,8 @@ with col1:
     # Global difficulty slider with human-friendly description
     # Get live difficulty if simulation is running
     live_difficulty = None
-    if st.session_state['sim_running'] and SIM_API_AVAILABLE:
-        try:
-            stats = get_stats()
-            if stats and 'difficulty' in stats:
-                live_difficulty = stats['difficulty']
-        except Exception:
-            pass
+    if st.session_state['sim_running'] and stats and 'difficulty' in stats:
+        live_difficulty = stats['difficulty']
     
     # Use live difficulty for slider value if available, otherwise use session state
     difficulty_value = live_difficulty if live_difficulty is not None else st.session_state.get('difficulty', 4)
@@ -249,7 +269,7 @@ with col1:
             }
             
             if SIM_API_AVAILABLE:
-                start_simulation(config, ui_callback)
+                start_simulation(config, make_ui_callback(st.session_state['event_queue']))
             else:
                 st.info("Mock mode: Simulation started")
             
@@ -278,13 +298,8 @@ with col1:
                 
                 # Get current difficulty from blockchain if it exists, otherwise use slider
                 resume_difficulty = difficulty
-                if SIM_API_AVAILABLE:
-                    try:
-                        stats = get_stats()
-                        if stats and 'difficulty' in stats:
-                            resume_difficulty = stats['difficulty']
-                    except Exception:
-                        pass
+                if stats and 'difficulty' in stats:
+                    resume_difficulty = stats['difficulty']
                 
                 config = {
                     'num_miners': num_miners,
@@ -294,7 +309,7 @@ with col1:
                 }
                 
                 if SIM_API_AVAILABLE:
-                    start_simulation(config, ui_callback)
+                    start_simulation(config, make_ui_callback(st.session_state['event_queue']))
                 st.session_state['sim_running'] = True
                 st.success("Simulation resumed!")
                 st.rerun()
@@ -305,6 +320,7 @@ with col1:
             reset_simulation()
         st.session_state['events'] = []
         # Clear cached visualization state
+        clear_render_caches()
         if 'last_blocks' in st.session_state:
             del st.session_state['last_blocks']
         if 'last_fork_tree' in st.session_state:
@@ -344,15 +360,11 @@ with col2:
     with metrics_col1:
         # Prefer authoritative count from sim API when available
         total_blocks = 0
-        if SIM_API_AVAILABLE:
-            try:
-                stats = get_stats()
-                if stats and 'blocks' in stats:
-                    total_blocks = len(stats['blocks'])
-            except Exception:
-                # Fallback to events
-                total_blocks = len([e for e in st.session_state['events'] if e.get('type') == 'block_accepted'])
+        if stats is not None:
+            if 'blocks' in stats:
+                total_blocks = len(stats['blocks'])
         else:
+            # Fallback to events
             total_blocks = len([e for e in st.session_state['events'] if e.get('type') == 'block_accepted'])
 
         st.metric("Total Blocks", total_blocks)
@@ -361,13 +373,8 @@ with col2:
     with metrics_col2:
         # Get live difficulty from simulation if running
         current_difficulty = difficulty
-        if SIM_API_AVAILABLE:
-            try:
-                stats = get_stats()
-                if stats and 'difficulty' in stats:
-                    current_difficulty = stats['difficulty']
-            except Exception:
-                pass
+        if stats and 'difficulty' in stats:
+            current_difficulty = stats['difficulty']
         st.metric("Current Difficulty", current_difficulty)
 
     st.subheader(" Visualization")
@@ -390,43 +397,38 @@ if st.session_state['sim_running']:
     # Update block area - get blocks from stats (authoritative source)
     blocks = []
     
-    if SIM_API_AVAILABLE:
-        try:
-            stats = get_stats()
-            if stats and 'blocks' in stats:
-                # Use blocks from blockchain (these have correct accepted status)
-                blocks = stats['blocks']
-                # Store in session state for paused view
-                st.session_state['last_blocks'] = blocks
-        except Exception as e:
-            # Fallback to events if stats fails
-            for event in st.session_state['events']:
-                if event.get('type') == 'block_found' and 'block' in event:
-                    event_block = event['block']
-                    # Ensure accepted field exists (default to True for found blocks)
-                    if 'accepted' not in event_block:
-                        event_block['accepted'] = True
-                    if not any(b.get('height') == event_block.get('height') for b in blocks):
-                        blocks.append(event_block)
+    if stats and 'blocks' in stats:
+        # Use blocks from blockchain (these have correct accepted status)
+        blocks = stats['blocks']
+        # Store in session state for paused view
+        st.session_state['last_blocks'] = blocks
+    elif stats is None and SIM_API_AVAILABLE:
+        # Fallback to events if stats fails
+        for event in st.session_state['events']:
+            if event.get('type') == 'block_found' and 'block' in event:
+                event_block = event['block']
+                # Ensure accepted field exists (default to True for found blocks)
+                if 'accepted' not in event_block:
+                    event_block['accepted'] = True
+                if not any(b.get('height') == event_block.get('height') for b in blocks):
+                    blocks.append(event_block)
     
     if blocks:
-        block_html = render_blocks(blocks)  # Show all blocks with scroll
+        block_html = render_blocks(blocks)  # Newest blocks, with scroll
         block_area.markdown(block_html, unsafe_allow_html=True)
     else:
         block_area.info("No blocks mined yet...")
     
     # Update 2D block visualization
-    try:
-        stats = get_stats()
-        if stats and 'fork_tree' in stats and stats['fork_tree'] and stats['fork_tree'].get('genesis'):
-            block_map_html = _render_2d_blocks(stats['fork_tree'])
-            block_map_area.markdown(block_map_html, unsafe_allow_html=True)
-            # Store in session state for paused view
-            st.session_state['last_fork_tree'] = stats['fork_tree']
-        else:
-            block_map_area.info("Waiting for blocks...")
-    except Exception as e:
+    if stats is None:
         block_map_area.info("Blocks loading...")
+    elif 'fork_tree' in stats and stats['fork_tree'] and stats['fork_tree'].get('genesis'):
+        block_map_html = _render_2d_blocks(stats['fork_tree'])
+        block_map_area.markdown(block_map_html, unsafe_allow_html=True)
+        # Store in session state for paused view
+        st.session_state['last_fork_tree'] = stats['fork_tree']
+    else:
+        block_map_area.info("Waiting for blocks...")
     
     # Auto-refresh every 2 seconds
     time.sleep(2)
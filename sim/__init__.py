@@ -4,7 +4,7 @@ Exports main classes for external use.
 """
 
 from .core import Block, Blockchain
-from .miner import Miner
+from .miner import Miner, WorkBoard, WorkPacket
 from .network import Network
 from .difficulty import DifficultyController
 
@@ -12,6 +12,8 @@ __all__ = [
     'Block',
     'Blockchain',
     'Miner',
+    'WorkBoard',
+    'WorkPacket',
     'Network',
     'DifficultyController'
 ]
@@ -6,7 +6,10 @@ from dataclasses import dataclass
 from typing import Optional, Dict, List, Any
 import time
 import threading
-from utils.hash_utils import compute_block_hash, hash_meets_difficulty
+from utils.hash_utils import compute_block_hash, difficulty_threshold
+
+# Genesis block has no previous hash
+GENESIS_PREV_HASH = "0" * 64
 
 @dataclass
 class Block:
@@ -43,6 +46,8 @@ class Blockchain:
         # Main chain (list of blocks from genesis -> tip)
         self._main_chain: List[Block] = []
         self.difficulty = 4  # Default difficulty
+        # Hash threshold for self.difficulty, refreshed by set_difficulty
+        self._hash_threshold = difficulty_threshold(self.difficulty)
         self._lock = threading.Lock()  # Thread safety for concurrent mining
 
         # Create genesis block
@@ -53,7 +58,7 @@ class Blockchain:
         from utils.hash_utils import compute_block_hash
         
         genesis_timestamp = time.time()
-        genesis_prev_hash = "0" * 64  # Genesis block has no previous hash
+        genesis_prev_hash = GENESIS_PREV_HASH
         genesis_data = "Genesis Block"
         genesis_nonce = 0
         genesis_miner_id = "genesis"
@@ -167,7 +172,8 @@ class Blockchain:
             return False
 
         # 2. Check if hash meets difficulty requirement
-        if not hash_meets_difficulty(block.hash, self.difficulty):
+        # (same check as hash_meets_difficulty, with the threshold precomputed)
+        if not block.hash < self._hash_threshold:
             return False
 
         # 3. Validate timestamp
@@ -209,6 +215,7 @@ class Blockchain:
     def set_difficulty(self, difficulty: int) -> None:
         """Set the mining difficulty for new blocks."""
         self.difficulty = difficulty
+        self._hash_threshold = difficulty_threshold(difficulty)
 
     def get_main_chain(self) -> List[Block]:
         """Return the current main chain (genesis -> tip)."""
@@ -220,6 +227,11 @@ class Blockchain:
         with self._lock:
             return dict(self._blocks)
 
+    def get_fork_block_count(self) -> int:
+        """Get the number of known blocks that are not on the main chain."""
+        with self._lock:
+            return len(self._blocks) - len(self._main_chain)
+
     def get_fork_tree(self) -> Dict[str, Any]:
         """
         Build a tree structure showing all branches (main chain and forks).
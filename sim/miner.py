@@ -5,10 +5,54 @@ Miner implementation for Proof-of-Work simulation.
 import threading
 import time
 import random
-import hashlib
-from typing import Callable, Optional
+from typing import Any, Callable, NamedTuple, Optional
 from .core import Block, Blockchain
-from utils.hash_utils import compute_block_hash, hash_meets_difficulty
+from utils.hash_utils import compute_block_hash, hash_meets_difficulty, block_hash_prefix, find_nonce_from_prefix
+
+DEFAULT_BLOCK_DATA = "Hello Blockchain!"
+
+class WorkPacket(NamedTuple):
+    """Immutable unit of mining work (chain head, data and difficulty)."""
+    prev_hash: Any
+    height: int
+    data: str
+    difficulty: int
+    version: int
+
+class WorkBoard:
+    """Holds the current WorkPacket that one or more miners mine on.
+
+    Publishing swaps in a new packet with a bumped version; miners read
+    `current` without locking (a single attribute load) and notice new work
+    by the version change at their next cycle.
+    """
+
+    def __init__(self, data: str = DEFAULT_BLOCK_DATA, difficulty: int = 4):
+        """
+        Initialize a work board.
+
+        Args:
+            data: Initial block data
+            difficulty: Initial mining difficulty
+        """
+        self.current = WorkPacket(prev_hash=0, height=0, data=data,
+                                  difficulty=difficulty, version=0)
+        self._lock = threading.Lock()  # Serializes publishers only
+
+    def publish(self, **changes) -> WorkPacket:
+        """
+        Publish new work, carrying over any fields not given.
+
+        Args:
+            **changes: WorkPacket fields to update (prev_hash, height, data, difficulty)
+
+        Returns:
+            The newly published packet
+        """
+        with self._lock:
+            packet = self.current._replace(version=self.current.version + 1, **changes)
+            self.current = packet
+        return packet
 
 class Miner:
     """Represents a blockchain miner that attempts to find valid blocks.
@@ -16,18 +60,20 @@ class Miner:
     This miner uses a simple deterministic model: it performs N hash
     attempts every cycle, where N = int(hash_rate * cycle_time). Each
     attempt computes the block hash and checks against the difficulty
-    using `hash_meets_difficulty`. The miner exposes `set_work` so the
-    simulation can update the current head/difficulty without restarting
-    the miner thread.
+    using `hash_meets_difficulty`. Work comes from a `WorkBoard`, which the
+    simulation can share between miners so a single publish updates the
+    head/difficulty for all of them without restarting the miner threads.
     """
 
-    def __init__(self, miner_id: str, hash_rate: float = 1.0):
+    def __init__(self, miner_id: str, hash_rate: float = 1.0,
+                 work_board: Optional[WorkBoard] = None):
         """
         Initialize a miner.
 
         Args:
             miner_id: Unique identifier for this miner
             hash_rate: Hash attempts per second (computational power)
+            work_board: Board to take work from (a private one if not given)
         """
         self.id = miner_id
         self.hash_rate = float(hash_rate)  # Hashes per second
@@ -36,16 +82,24 @@ class Miner:
         self.on_block_found: Optional[Callable] = None
         self.blockchain: Optional[Blockchain] = None
         self.use_real_sha256 = False
-        self.difficulty = 4
-        self.current_data = "Hello Blockchain!"
 
-        # Current mining work (set by sim_api)
-        self.prev_hash = 0
-        self.height = 0
+        # Current mining work (published by sim_api)
+        self.work_board = work_board if work_board is not None else WorkBoard()
+        # start() only publishes to a private board; a shared one belongs to its owner
+        self._owns_board = work_board is None
 
-        # Internal state
+        # Internal state (only touched by the mining thread)
         self._nonce = random.randint(0, 2**32 - 1)
-        self._lock = threading.Lock()
+
+    @property
+    def current_data(self) -> str:
+        """Data of the block currently being mined."""
+        return self.work_board.current.data
+
+    @property
+    def difficulty(self) -> int:
+        """Difficulty of the block currently being mined."""
+        return self.work_board.current.difficulty
         
     def start(self, on_block_found: Callable, blockchain: Blockchain,
               use_real_sha256: bool = False, difficulty: int = 4, 
@@ -57,8 +111,8 @@ class Miner:
             on_block_found: Callback function when a block is found
             blockchain: Reference to the blockchain to mine on
             use_real_sha256: Whether to use real SHA256 or fast simulation
-            difficulty: Mining difficulty target
-            data: Data to include in the block
+            difficulty: Mining difficulty target (private work board only)
+            data: Data to include in the block (private work board only)
         """
         if self.is_mining:
             return
@@ -66,8 +120,8 @@ class Miner:
         self.on_block_found = on_block_found
         self.blockchain = blockchain
         self.use_real_sha256 = use_real_sha256
-        self.difficulty = difficulty
-        self.current_data = data
+        if self._owns_board:
+            self.work_board.publish(data=data, difficulty=difficulty)
         self.is_mining = True
 
         # Start mining thread
@@ -84,53 +138,64 @@ class Miner:
         """Main mining loop using a single consistent model.
 
         Every cycle we perform `attempts = max(1, int(hash_rate * cycle_time))`
-        hash attempts. Each attempt computes an actual block hash and tests
-        it against the current difficulty. If a valid block is found we call
-        `on_block_found(block)` and then continue (the simulation will
-        broadcast new work which `set_work` will apply).
+        hash attempts over a consecutive nonce range, searched with
+        `find_nonce_from_prefix` against the current difficulty. If a valid
+        block is found we call `on_block_found(block)` and then continue (the
+        simulation publishes new work to the shared `WorkBoard`, which this
+        loop picks up by its version change next cycle). The time spent
+        hashing counts towards the cycle, so the configured hash rate holds
+        even when miner threads compete for the interpreter.
         """
         cycle_time = 0.05  # Reduced from 0.1 to 0.05 for more responsive mining
+        seen_version = None
 
         while self.is_mining:
-            # Snapshot work atomically
-            with self._lock:
-                prev_hash = self.prev_hash
-                height = self.height
-                data = self.current_data
-                difficulty = self.difficulty
-
+            cycle_start = time.monotonic()
             attempts = max(1, int(self.hash_rate * cycle_time))
+
+            # Pick up the latest published work (immutable, so no lock needed)
+            work = self.work_board.current
+            if work.version != seen_version:
+                seen_version = work.version
+                # Everything but timestamp and nonce is fixed for this work
+                prefix = block_hash_prefix(work.prev_hash, work.height + 1, work.data, self.id)
+                # reset nonce to a random value to avoid aligned search
+                self._nonce = random.randint(0, 2**32 - 1)
+
+            # Reserve this cycle's nonce range
+            start_nonce = self._nonce
+            self._nonce = (start_nonce + attempts) & 0xFFFFFFFF
+
+            prev_hash = work.prev_hash
+            height = work.height
+            data = work.data
             timestamp = time.time()
 
-            found = False
-            for _ in range(attempts):
-                with self._lock:
-                    nonce = self._nonce
-                    # advance nonce for next attempt
-                    self._nonce = (self._nonce + 1) & 0xFFFFFFFF
-
-                h = compute_block_hash(prev_hash, height + 1, timestamp, data, nonce, self.id)
-                if hash_meets_difficulty(h, difficulty):
-                    block = Block(
-                        height=height + 1,
-                        prev_hash=prev_hash,
-                        timestamp=timestamp,
-                        data=data,
-                        nonce=nonce,
-                        miner_id=self.id,
-                        hash=h
-                    )
-                    if self.on_block_found:
-                        try:
-                            self.on_block_found(block)
-                        except Exception:
-                            pass
-                    found = True
-                    break
-
-            # Sleep to respect cycle pacing
+            result = find_nonce_from_prefix(prefix, timestamp, work.difficulty,
+                                            start_nonce, attempts)
+            found = result is not None
+            if found:
+                nonce, h = result
+                block = Block(
+                    height=height + 1,
+                    prev_hash=prev_hash,
+                    timestamp=timestamp,
+                    data=data,
+                    nonce=nonce,
+                    miner_id=self.id,
+                    hash=h
+                )
+                if self.on_block_found:
+                    try:
+                        self.on_block_found(block)
+                    except Exception:
+                        pass
+
+            # Sleep out the rest of the cycle to respect pacing
             if self.is_mining:
-                time.sleep(cycle_time)
+                remaining = cycle_time - (time.monotonic() - cycle_start)
+                if remaining > 0:
+                    time.sleep(remaining)
 
             # If we found a block, yield to allow simulation to update work
             if found:
@@ -185,11 +250,10 @@ class Miner:
         return self.is_mining
 
     def set_work(self, prev_hash, height: int, data: str, difficulty: int) -> None:
-        """Update current work (head) atomically without restarting miner."""
-        with self._lock:
-            self.prev_hash = prev_hash
-            self.height = height
-            self.current_data = data
-            self.difficulty = difficulty
-            # reset nonce to a random value to avoid aligned search
-            self._nonce = random.randint(0, 2**32 - 1)
\ No newline at end of file
+        """Update current work (head) atomically without restarting miner.
+
+        Publishes to this miner's work board, so miners sharing the board
+        all pick up the new work.
+        """
+        self.work_board.publish(prev_hash=prev_hash, height=height,
+                                data=data, difficulty=difficulty)
\ No newline at end of file
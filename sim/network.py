@@ -5,6 +5,7 @@ Network simulation for blockchain communication with latency.
 import threading
 import time
 import queue
+import itertools
 from typing import Dict, Any, Callable, Optional
 from dataclasses import dataclass
 
@@ -24,6 +25,9 @@ class Network:
     def __init__(self):
         """Initialize the network simulation."""
         self.message_queue = queue.PriorityQueue()
+        # Tie-breaker so messages due at the same time keep FIFO order
+        # (NetworkMessage itself is not orderable)
+        self._sequence = itertools.count()
         self.subscribers: Dict[str, Callable] = {}
         self.running = False
         self.network_thread: Optional[threading.Thread] = None
@@ -52,7 +56,7 @@ class Network:
             delay_s: Delay in seconds before delivery
         """
         delivery_time = time.time() + delay_s
-        self.message_queue.put((delivery_time, message))
+        self.message_queue.put((delivery_time, next(self._sequence), message))
         
     def subscribe(self, node_id: str, callback: Callable) -> None:
         """
@@ -74,7 +78,7 @@ class Network:
         while self.running:
             try:
                 # Get next message to deliver
-                delivery_time, message = self.message_queue.get(timeout=0.1)
+                delivery_time, _, message = self.message_queue.get(timeout=0.1)
                 
                 # Wait until delivery time
                 current_time = time.time()
@@ -5,9 +5,11 @@ Provides thread-safe interface for simulation control.
 
 import threading
 import time
-from typing import Dict, Any, Callable, List
+from array import array
+from collections import deque
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from sim.core import Blockchain
-from sim.miner import Miner
+from sim.miner import Miner, WorkBoard, DEFAULT_BLOCK_DATA
 from sim.network import Network
 from sim.difficulty import DifficultyController
 
@@ -15,13 +17,51 @@ from sim.difficulty import DifficultyController
 _simulation_lock = threading.Lock()
 _simulation_running = False
 _blockchain: Blockchain = None
-_miners: List[Miner] = []
+# Rebound (never mutated) on start/reset, so threads can iterate it without the lock
+_miners: Tuple[Miner, ...] = ()
+_miners_by_id: Dict[str, Miner] = {}
+# Shared by all miners; publishing to it is how new work reaches them
+_work_board: WorkBoard = None
 _network: Network = None
+# Network node that validates and accepts found blocks (one delivery thread)
+_BLOCK_ACCEPTOR = "acceptor"
 _difficulty_controller: DifficultyController = None
 _ui_callback: Callable = None
-_event_queue = None
+# Events for the UI. Producers publish through _publish_event and the UI drains
+# through get_pending_events; deque.append/popleft are atomic in CPython, so
+# neither side takes any lock. Bounded so that, when nobody polls, only the
+# newest events are kept instead of growing for the life of the process.
+_EVENT_QUEUE_MAXLEN = 1000
+_event_queue: deque = deque(maxlen=_EVENT_QUEUE_MAXLEN)
+# Events waiting for the UI callback, delivered in batches by the flusher thread
+_ui_outbox: deque = deque()
+_flusher_thread: threading.Thread = None
+# Stop signal for the current flusher thread; a fresh Event per start, as for
+# pruning, so a late stop can only end the flusher it captured
+_flusher_stop: threading.Event = threading.Event()
+_UI_FLUSH_INTERVAL = 1 / 30  # Cap UI callback rate at ~30 Hz
 _pruning_thread: threading.Thread = None
-_pruning_active = False
+# Stop signal for the current pruning thread; a fresh Event per start so a
+# lingering old thread can never be revived by a quick restart
+_pruning_stop: threading.Event = threading.Event()
+_PRUNING_INTERVAL = 5.0  # Seconds between pruning/timeout checks
+# Set when a block lands off the main chain; cleared by the pruning loop once
+# no fork blocks remain, so fork-free runs never take the lock to prune
+_forks_dirty = False
+
+# Accepted/stale block counters. Written only under _simulation_lock, but a
+# single array item store is atomic under the GIL so readers can snapshot
+# them without taking the lock.
+_ACCEPTED = 0
+_STALE = 1
+_block_counts = array('Q', [0, 0])
+
+# get_stats caches, maintained where miners/blocks change rather than
+# recomputed on every UI poll
+_cached_total_hash_rate = 0.0
+_cached_active_miners = 0
+_cached_blocks_view: List[Dict[str, Any]] = []
+_blocks_view_dirty = True
 
 def start_simulation(config: Dict[str, Any], ui_callback: Callable) -> None:
     """
@@ -31,15 +71,12 @@ def start_simulation(config: Dict[str, Any], ui_callback: Callable) -> None:
         config: Simulation configuration dictionary
         ui_callback: Function to call for UI updates
     """
-    global _simulation_running, _blockchain, _miners, _network, _difficulty_controller, _ui_callback, _event_queue
+    global _simulation_running, _blockchain, _miners, _miners_by_id, _work_board, _network, _difficulty_controller, _ui_callback
+    global _cached_total_hash_rate, _cached_active_miners, _blocks_view_dirty
     
     with _simulation_lock:
         if _simulation_running:
             return
-        
-        # Initialize event queue for UI updates
-        import queue
-        _event_queue = queue.Queue()
             
         # Initialize simulation components (reuse blockchain if it exists)
         if _blockchain is None:
@@ -48,8 +85,8 @@ def start_simulation(config: Dict[str, Any], ui_callback: Callable) -> None:
         else:
             print(f"\n[BLOCKCHAIN] Resuming blockchain at height {_blockchain.get_block_count()})")
             
-        _miners = []
         _network = Network()
+        _network.subscribe(_BLOCK_ACCEPTOR, _on_block_delivered)
         _difficulty_controller = DifficultyController()
         _ui_callback = ui_callback
         
@@ -62,118 +99,147 @@ def start_simulation(config: Dict[str, Any], ui_callback: Callable) -> None:
         # Create miners with configured hash rates
         num_miners = config.get('num_miners', 3)
         miner_rates = config.get('miner_rates', {})
+        _work_board = WorkBoard(data=config.get('data', DEFAULT_BLOCK_DATA), difficulty=new_difficulty)
+        miners = []
         for i in range(num_miners):
             miner_id = f"miner_{i+1}"
             hash_rate = miner_rates.get(miner_id, 500)  # Default 500 H/s for 1 crore hash space
-            miner = Miner(miner_id, hash_rate=hash_rate)
-            _miners.append(miner)
+            miner = Miner(miner_id, hash_rate=hash_rate, work_board=_work_board)
+            miners.append(miner)
             print(f"Created {miner_id} with hash rate: {hash_rate} H/s")
+        _miners = tuple(miners)
+        _miners_by_id = {m.id: m for m in _miners}
+        _cached_total_hash_rate = sum(m.hash_rate for m in _miners)
+        _blocks_view_dirty = True
             
         # Start network
         _network.start()
         
-        # Set initial work and start miners
-        head = _blockchain.get_latest_block()
-        prev_hash = head.hash if head else 0
-        height = head.height if head else 0
+        # Publish the initial work once (the board already holds data and
+        # difficulty), then start miners on it
+        _broadcast_new_work_to_miners(_blockchain, _work_board)
         for miner in _miners:
             miner.start(
                 on_block_found=_on_block_found,
                 blockchain=_blockchain,
-                use_real_sha256=config.get('use_real_sha256', False),
-                difficulty=config.get('difficulty', 4),
-                data=config.get('data', 'Hello Blockchain!')
+                use_real_sha256=config.get('use_real_sha256', False)
             )
-
-        # Broadcast initial work (head/difficulty/data) to all miners
-        _broadcast_new_work_to_miners()
         
         # Start branch pruning thread
-        global _pruning_thread, _pruning_active
-        _pruning_active = True
-        _pruning_thread = threading.Thread(target=_pruning_loop, daemon=True)
+        global _pruning_thread, _pruning_stop
+        _pruning_stop = threading.Event()
+        _pruning_thread = threading.Thread(target=_pruning_loop, args=(_pruning_stop,), daemon=True)
         _pruning_thread.start()
+        
+        # Start UI event flusher thread
+        global _flusher_thread, _flusher_stop
+        _flusher_stop = threading.Event()
+        _flusher_thread = threading.Thread(target=_flush_loop, args=(_flusher_stop,), daemon=True)
+        _flusher_thread.start()
             
         _simulation_running = True
+        _cached_active_miners = sum(1 for m in _miners if m.is_mining)
         
-        # Notify UI with genesis block
-        if _ui_callback:
-            _ui_callback({
-                'timestamp': time.time(),
-                'message': f'Started simulation with {num_miners} miners',
-                'type': 'simulation_start'
-            })
-            
-            # Send genesis block to UI
-            main_chain = _blockchain.get_main_chain()
-            genesis_block = main_chain[0] if main_chain else None
-            if genesis_block:
-                _ui_callback({
-                    'timestamp': time.time(),
-                    'message': f'Genesis block created (height 0)',
-                    'type': 'block_found',
-                    'block': {
-                        'height': genesis_block.height,
-                        'hash': genesis_block.hash,
-                        'prev_hash': genesis_block.prev_hash,
-                        'nonce': genesis_block.nonce,
-                        'miner_id': genesis_block.miner_id,
-                        'timestamp': genesis_block.timestamp,
-                        'accepted': genesis_block.accepted
-                    }
-                })
+        main_chain = _blockchain.get_main_chain()
+        genesis_block = main_chain[0] if main_chain else None
+
+    # Notify UI outside the lock
+    _publish_event({
+        'timestamp': time.time(),
+        'message': f'Started simulation with {num_miners} miners',
+        'type': 'simulation_start'
+    })
+    
+    # Send genesis block to UI
+    if genesis_block:
+        _publish_event({
+            'timestamp': time.time(),
+            'message': f'Genesis block created (height 0)',
+            'type': 'block_found',
+            'block': _block_to_dict(genesis_block, genesis_block.accepted)
+        })
 
 def stop_simulation() -> None:
     """Stop the running simulation."""
-    global _simulation_running, _pruning_active
+    global _simulation_running, _cached_active_miners
     
     with _simulation_lock:
         if not _simulation_running:
             return
         
-        # Stop pruning thread
-        _pruning_active = False
+        # Stop pruning and flusher threads
+        _pruning_stop.set()
+        _flusher_stop.set()
+        flusher_thread = _flusher_thread
             
         # Stop all miners
         for miner in _miners:
             miner.stop()
             
-        # Stop network
-        if _network:
-            _network.stop()
-            
+        network = _network
         _simulation_running = False
+        _cached_active_miners = 0
         
-        # Notify UI
-        if _ui_callback:
-            _ui_callback({
-                'timestamp': time.time(),
-                'message': 'Simulation stopped',
-                'type': 'simulation_stop'
-            })
+    # Stop network outside the lock: its delivery thread may be waiting on
+    # the lock to accept a block, and will drop it once it gets in
+    if network:
+        network.stop()
+        
+    # Notify UI
+    _publish_event({
+        'timestamp': time.time(),
+        'message': 'Simulation stopped',
+        'type': 'simulation_stop'
+    })
+    _stop_flusher(flusher_thread)
 
 def reset_simulation() -> None:
     """Reset the blockchain and all simulation state."""
-    global _blockchain, _miners, _network, _difficulty_controller, _simulation_running, _pruning_active
+    global _blockchain, _miners, _miners_by_id, _work_board, _network, _difficulty_controller, _simulation_running, _forks_dirty
+    global _cached_total_hash_rate, _cached_active_miners, _cached_blocks_view, _blocks_view_dirty
     
+    network = None
+    flusher_thread = None
     with _simulation_lock:
         # Stop simulation if running
         if _simulation_running:
-            _pruning_active = False
+            _pruning_stop.set()
+            _flusher_stop.set()
+            flusher_thread = _flusher_thread
             for miner in _miners:
                 miner.stop()
-            if _network:
-                _network.stop()
+            network = _network
             _simulation_running = False
         
         # Reset all global state
         _blockchain = None
-        _miners = []
+        _miners = ()
+        _miners_by_id = {}
+        _work_board = None
         _network = None
         _difficulty_controller = None
+        _forks_dirty = False
+        _cached_total_hash_rate = 0.0
+        _cached_active_miners = 0
+        _cached_blocks_view = []
+        _blocks_view_dirty = True
+        get_pending_events()
+        _block_counts[_ACCEPTED] = 0
+        _block_counts[_STALE] = 0
         
         print("[RESET] Blockchain and simulation state cleared")
 
+    # Stopped outside the lock, as in stop_simulation
+    if network:
+        network.stop()
+    # Discard the old run's undelivered events rather than flushing them into
+    # a UI that is clearing its log; keep them if a new run already started
+    if flusher_thread:
+        _stop_flusher(flusher_thread, flush=False)
+    with _simulation_lock:
+        if not _simulation_running:
+            _ui_outbox.clear()
+
 def set_miner_rate(miner_id: str, rate: float) -> None:
     """
     Set the hash rate for a specific miner.
@@ -182,14 +248,20 @@ def set_miner_rate(miner_id: str, rate: float) -> None:
         miner_id: ID of the miner to update
         rate: New hash rate
     """
+    global _cached_total_hash_rate
+
+    # Unlocked fast path; re-checked under the lock below
+    if not _simulation_running:
+        return
+
     with _simulation_lock:
         if not _simulation_running:
             return
             
-        for miner in _miners:
-            if miner.id == miner_id:
-                miner.set_hash_rate(rate)
-                break
+        miner = _miners_by_id.get(miner_id)
+        if miner:
+            _cached_total_hash_rate += rate - miner.hash_rate
+            miner.set_hash_rate(rate)
 
 def submit_data(data_str: str) -> None:
     """
@@ -198,23 +270,24 @@ def submit_data(data_str: str) -> None:
     Args:
         data_str: Data to include in next block
     """
+    # Unlocked fast path; re-checked under the lock below
+    if not _simulation_running:
+        return
+
     with _simulation_lock:
         if not _simulation_running:
             return
             
-        # Update all miners with new data while preserving their current work
-        head = _blockchain.get_latest_block()
-        prev_hash = head.hash if head else 0
-        height = head.height if head else 0
-        for miner in _miners:
-            miner.current_data = data_str
-            
-        if _ui_callback:
-            _ui_callback({
-                'timestamp': time.time(),
-                'message': f'Submitted data: {data_str}',
-                'type': 'data_submission'
-            })
+        work_board = _work_board
+
+    # Update all miners with new data while preserving their current head
+    work_board.publish(data=data_str)
+    
+    _publish_event({
+        'timestamp': time.time(),
+        'message': f'Submitted data: {data_str}',
+        'type': 'data_submission'
+    })
 
 def get_stats() -> Dict[str, Any]:
     """
@@ -223,35 +296,29 @@ def get_stats() -> Dict[str, Any]:
     Returns:
         Dictionary containing simulation stats
     """
+    global _cached_blocks_view, _blocks_view_dirty
+
+    # Counters are safe to read without the lock
+    accepted_blocks, stale_blocks = _block_counts
+
+    # Unlocked fast path; re-checked under the lock below
+    if not _simulation_running:
+        return _idle_stats(accepted_blocks, stale_blocks)
+
     with _simulation_lock:
         if not _simulation_running:
-            return {
-                'blocks': [],
-                'mining_log': 'Simulation not running',
-                'active_miners': 0,
-                'total_hash_rate': 0,
-                'difficulty': 0,
-                'fork_tree': None
-            }
+            return _idle_stats(accepted_blocks, stale_blocks)
             
-        # Collect main chain block data with accepted status
-        blocks = []
-        try:
-            main_chain = _blockchain.get_main_chain()
-        except Exception:
-            main_chain = []
-
-        for block in main_chain:
-            blocks.append({
-                'height': block.height,
-                'hash': block.hash,
-                'prev_hash': block.prev_hash,
-                'miner_id': block.miner_id,
-                'data': block.data,
-                'timestamp': block.timestamp,
-                'nonce': block.nonce,
-                'accepted': block.accepted  # Include accepted status
-            })
+        # Collect main chain block data with accepted status, rebuilt only
+        # after the main chain has changed
+        if _blocks_view_dirty:
+            try:
+                main_chain = _blockchain.get_main_chain()
+            except Exception:
+                main_chain = []
+            _cached_blocks_view = [_block_to_dict(block, block.accepted) for block in main_chain]
+            _blocks_view_dirty = False
+        blocks = list(_cached_blocks_view)
         
         # Get fork tree for visualization
         try:
@@ -259,9 +326,8 @@ def get_stats() -> Dict[str, Any]:
         except Exception:
             fork_tree = None
             
-        # Calculate mining stats
-        active_miners = sum(1 for miner in _miners if miner.is_mining)
-        total_hash_rate = sum(miner.hash_rate for miner in _miners)
+        active_miners = _cached_active_miners
+        total_hash_rate = _cached_total_hash_rate
         
         return {
             'blocks': blocks,
@@ -269,22 +335,118 @@ def get_stats() -> Dict[str, Any]:
             'active_miners': active_miners,
             'total_hash_rate': total_hash_rate,
             'difficulty': _difficulty_controller.get_current_difficulty() if _difficulty_controller else 0,
+            'accepted_blocks': accepted_blocks,
+            'stale_blocks': stale_blocks,
             'fork_tree': fork_tree
         }
 
-def _broadcast_new_work_to_miners():
-    """Set current head/difficulty as work for all miners."""
-    head = _blockchain.get_latest_block()
-    prev_hash = head.hash if head else 0
-    height = head.height if head else 0
-    current_data = _miners[0].current_data if _miners else 'Hello Blockchain!'
-    current_difficulty = _blockchain.difficulty
-    for miner in _miners:
+def get_pending_events() -> List[Dict[str, Any]]:
+    """
+    Drain all events published since the last call.
+    
+    Does not take the simulation lock, so polling never stalls miner threads.
+    
+    Returns:
+        List of event dictionaries in publication order
+    """
+    return _drain(_event_queue)
+
+def _idle_stats(accepted_blocks: int, stale_blocks: int) -> Dict[str, Any]:
+    """Stats reported while the simulation is not running."""
+    return {
+        'blocks': [],
+        'mining_log': 'Simulation not running',
+        'active_miners': 0,
+        'total_hash_rate': 0,
+        'difficulty': 0,
+        'accepted_blocks': accepted_blocks,
+        'stale_blocks': stale_blocks,
+        'fork_tree': None
+    }
+
+def _block_to_dict(block, accepted: bool) -> Dict[str, Any]:
+    """Build the block payload used in events and stats."""
+    return {
+        'height': block.height,
+        'hash': block.hash,
+        'prev_hash': block.prev_hash,
+        'miner_id': block.miner_id,
+        'data': block.data,
+        'timestamp': block.timestamp,
+        'nonce': block.nonce,
+        'accepted': accepted
+    }
+
+def _drain(events: deque) -> List[Dict[str, Any]]:
+    """Pop everything currently in an event deque, oldest first."""
+    drained = []
+    try:
+        while True:
+            drained.append(events.popleft())
+    except IndexError:
+        return drained
+
+def _publish_event(event: Dict[str, Any]) -> None:
+    """Queue an event for get_pending_events and the batched UI callback."""
+    _event_queue.append(event)
+    if _ui_callback:
+        _ui_outbox.append(event)
+
+def _flush_ui_events() -> None:
+    """Deliver all events waiting for the UI callback as one batch."""
+    batch = _drain(_ui_outbox)
+    if batch and _ui_callback:
         try:
-            miner.set_work(prev_hash, height, current_data, current_difficulty)
+            _ui_callback(batch)
         except Exception:
             pass
 
+def _flush_loop(stop_event: threading.Event) -> None:
+    """
+    Background thread that hands events to the UI callback in batches.
+    
+    Producers only append to the outbox, so however fast blocks are found the
+    callback runs at most ~30 times per second.
+    
+    Args:
+        stop_event: Event set by stop/reset to end this thread
+    """
+    while not stop_event.wait(_UI_FLUSH_INTERVAL):
+        if _ui_outbox:
+            _flush_ui_events()
+
+def _stop_flusher(flusher_thread: threading.Thread, flush: bool = True) -> None:
+    """
+    Wait for a flusher thread to exit and deliver whatever it had not sent yet.
+    
+    The caller sets the thread's stop event under the simulation lock and
+    passes the thread it captured there, so a restart in the meantime is
+    left alone. Must be called without the simulation lock held.
+    
+    Args:
+        flusher_thread: The flusher thread that was signalled to stop
+        flush: Whether to deliver the remaining events to the UI callback
+    """
+    flusher_thread.join(timeout=1.0)
+    if flush:
+        _flush_ui_events()
+
+def _broadcast_new_work_to_miners(blockchain: Blockchain, work_board: WorkBoard) -> None:
+    """
+    Publish current head/difficulty as work for all miners.
+    
+    A single publish to the shared work board reaches every miner. Takes the
+    blockchain and board explicitly so callers can pass the references they
+    captured for the current run. Call it with the simulation lock held so
+    difficulty changes are published in the order they are made.
+    """
+    head = blockchain.get_latest_block()
+    work_board.publish(
+        prev_hash=head.hash if head else 0,
+        height=head.height if head else 0,
+        difficulty=blockchain.difficulty
+    )
+
 def _on_block_found(block) -> None:
     """
     Callback when a miner finds a new block.
@@ -292,74 +454,124 @@ def _on_block_found(block) -> None:
     Args:
         block: The newly found block
     """
+    # Stale miner callbacks after stop bail out here without touching the lock
+    if not _simulation_running:
+        return
+
     with _simulation_lock:
         if not _simulation_running:
             return
 
         # Capture previous head to compute block interval
         prev_head = _blockchain.get_latest_block()
+        network = _network
 
-        # Announce that a block was found (discovery)
-        print(f"\n[MINING] [{block.miner_id}] Found block #{block.height} with hash {block.hash} (nonce: {block.nonce})")
-        
-        discovery_event = {
-            'timestamp': time.time(),
-            'message': f'Block discovered (candidate) by {block.miner_id}',
-            'type': 'block_found',
-            'block': {
-                'height': block.height,
-                'hash': block.hash,
-                'prev_hash': block.prev_hash,
-                'miner_id': block.miner_id,
-                'data': block.data,
-                'timestamp': block.timestamp,
-                'nonce': block.nonce,
-                'accepted': False
-            }
-        }
-        # Put into internal event queue and notify UI via callback (if available)
-        try:
-            _event_queue.put(discovery_event)
-        except Exception:
-            pass
-        if _ui_callback:
-            try:
-                _ui_callback(discovery_event)
-            except Exception:
-                pass
+    # Announce that a block was found (discovery)
+    print(f"\n[MINING] [{block.miner_id}] Found block #{block.height} with hash {block.hash} (nonce: {block.nonce})")
+    
+    _publish_event({
+        'timestamp': time.time(),
+        'message': f'Block discovered (candidate) by {block.miner_id}',
+        'type': 'block_found',
+        'block': _block_to_dict(block, False)
+    })
 
-        # Queue block for delivery through network with delay
-        network_delay = 0.1  # 100ms network delay (simulated via Timer)
-        
-        # Schedule delayed acceptance via a callback
-        # (in a real network, blocks would propagate over the network with latency)
-        threading.Timer(
-            network_delay,
-            lambda: _accept_block_delayed(block, prev_head, discovery_event)
-        ).start()
+    # Queue block for delivery through network with delay
+    # (in a real network, blocks would propagate over the network with latency)
+    network_delay = 0.1  # 100ms network delay
+    network.send_message(block.miner_id, _BLOCK_ACCEPTOR, 'block', (block, prev_head),
+                         delay_s=network_delay)
 
-        # END OF NEW DELAYED NETWORK LOGIC
+
+def _on_block_delivered(message) -> None:
+    """
+    Network subscriber for the block acceptor node.
+    
+    Runs on the network's single delivery thread, so found blocks are
+    accepted one at a time in arrival order.
+    
+    Args:
+        message: NetworkMessage whose data is (block, prev_head)
+    """
+    block, prev_head = message.data
+    _accept_block_delayed(block, prev_head)
 
 
-def _accept_block_delayed(block, prev_head, discovery_event) -> None:
+def _accept_block_delayed(block, prev_head) -> None:
     """
-    Accept a block after network delay (called via Timer).
+    Accept a block after network delay (called from the network thread).
+    
+    Blockchain.add_block is atomic under the chain's own lock, so validation
+    and the main-chain rebuild run without the simulation lock. Only the
+    bookkeeping (counters, block view, difficulty controller) and the work
+    broadcast to miners take it; event publishing happens after it is
+    released.
     
     Args:
         block: The block to accept
         prev_head: The previous chain head
-        discovery_event: The discovery event that was already sent
     """
+    global _blocks_view_dirty
+
+    if not _simulation_running:
+        return
+
     with _simulation_lock:
         if not _simulation_running:
             return
-        
-        # Now validate and add the block
-        added = _blockchain.add_block(block)
-        _process_block_acceptance(block, added, prev_head, discovery_event)
+        blockchain = _blockchain
+        work_board = _work_board
+
+    # Now validate and add the block
+    added = blockchain.add_block(block)
+
+    with _simulation_lock:
+        # A reset while the block was being added leaves nothing to account for
+        if not _simulation_running or _blockchain is not blockchain:
+            return
+        _block_counts[_ACCEPTED if added else _STALE] += 1
+        if added:
+            _blocks_view_dirty = True
+        new_difficulty = _record_block_interval(block, prev_head) if added else None
+
+        # Broadcast new work to miners (new head, or current head in case another
+        # block moved it while this one was in flight). Published under the lock
+        # so a timeout difficulty drop in the pruning thread cannot be
+        # overwritten with the difficulty read here; the publish is O(1).
+        _broadcast_new_work_to_miners(blockchain, work_board)
+
+    _process_block_acceptance(block, added, prev_head, new_difficulty)
 
 
-def _process_block_acceptance(block, added, prev_head, discovery_event) -> None:
+def _record_block_interval(block, prev_head) -> Optional[int]:
+    """
+    Feed an accepted block's interval to the difficulty controller.
+    
+    Must be called with the simulation lock held.
+    
+    Args:
+        block: The accepted block
+        prev_head: The chain head the block was mined on
+    
+    Returns:
+        The new difficulty if the controller adjusted it, None otherwise
+    """
+    if not prev_head or not _difficulty_controller:
+        return None
+
+    block_time = block.timestamp - prev_head.timestamp
+    _difficulty_controller.record_block_time(block_time)
+
+    # Adjust difficulty if controller desires
+    if not _difficulty_controller.should_adjust_difficulty():
+        return None
+
+    new_difficulty = _difficulty_controller.adjust_difficulty(_difficulty_controller.block_times)
+    _blockchain.set_difficulty(new_difficulty)
+    return new_difficulty
+
+
+def _process_block_acceptance(block, added, prev_head, new_difficulty=None) -> None:
     """
     Process the result of block validation and acceptance.
     
@@ -367,48 +579,34 @@ def _process_block_acceptance(block, added, prev_head, discovery_event) -> None:
         block: The block that was validated
         added: Whether the block was added to the chain
         prev_head: The previous chain head
-        discovery_event: The discovery event that was sent
+        new_difficulty: Difficulty set as a result of this block, if any
     """
+    global _forks_dirty
+
+    # One clock read for every event this block produces
+    now = time.time()
+
     if added:
+        # A block not built on the previous head means a reorg left a side branch
+        if prev_head and block.prev_hash != prev_head.hash:
+            _forks_dirty = True
         print(f"[ACCEPTED] Block #{block.height} ACCEPTED by network (hash: {block.hash}, prev: {block.prev_hash})")
-        accepted_event = discovery_event.copy()
-        accepted_event['timestamp'] = time.time()
-        accepted_event['message'] = f'Block #{block.height} accepted (by {block.miner_id})'
-        accepted_event['type'] = 'block_accepted'
-        accepted_event['block']['accepted'] = True
-        try:
-            _event_queue.put(accepted_event)
-        except Exception:
-            pass
-        if _ui_callback:
-            try:
-                _ui_callback(accepted_event)
-            except Exception:
-                pass
-
-        # If we had a previous head, compute block time
-        if prev_head:
-            block_time = block.timestamp - prev_head.timestamp
-            if _difficulty_controller:
-                _difficulty_controller.record_block_time(block_time)
-
-                # Adjust difficulty if controller desires
-                if _difficulty_controller.should_adjust_difficulty():
-                    new_difficulty = _difficulty_controller.adjust_difficulty(_difficulty_controller.block_times)
-                    _blockchain.set_difficulty(new_difficulty)
-                    # Update miners' difficulty/work
-                    for miner in _miners:
-                        miner.difficulty = new_difficulty
-                    # Broadcast the change
-                    _event_queue.put({
-                        'timestamp': time.time(),
-                        'message': f'Difficulty adjusted to {new_difficulty}',
-                        'type': 'difficulty_update',
-                        'difficulty': new_difficulty
-                    })
+        # Fresh payload: the discovery event may still be held by the UI
+        _publish_event({
+            'timestamp': now,
+            'message': f'Block #{block.height} accepted (by {block.miner_id})',
+            'type': 'block_accepted',
+            'block': _block_to_dict(block, True)
+        })
 
-        # Broadcast new work (new head) to miners
-        _broadcast_new_work_to_miners()
+        if new_difficulty is not None:
+            # Broadcast the change
+            _publish_event({
+                'timestamp': now,
+                'message': f'Difficulty adjusted to {new_difficulty}',
+                'type': 'difficulty_update',
+                'difficulty': new_difficulty
+            })
 
     else:
         # STALE BLOCK EXPLANATION:
@@ -419,101 +617,99 @@ def _process_block_acceptance(block, added, prev_head, discovery_event) -> None:
         # 3. Invalid prev_hash (doesn't match current chain tip)
         # 4. Timestamp issues (too far in future, or not monotonic)
         # This is normal in PoW - miners sometimes work on outdated chain state.
+        # Valid-but-shorter blocks are kept as fork branches until pruned
+        _forks_dirty = True
         print(f"[REJECTED] Block #{block.height} REJECTED/STALE from {block.miner_id} (hash: {block.hash})")
         print(f"           Reason: Block doesn't meet validation (likely mining on old chain head)")
-        stale_event = discovery_event.copy()
-        stale_event['timestamp'] = time.time()
-        stale_event['message'] = f'Block #{block.height} from {block.miner_id} is stale/rejected'
-        stale_event['type'] = 'block_stale'
-        stale_event['block']['accepted'] = False
-        try:
-            _event_queue.put(stale_event)
-        except Exception:
-            pass
-        if _ui_callback:
-            try:
-                _ui_callback(stale_event)
-            except Exception:
-                pass
-
-        # Update miners with current head (in case the head changed due to another block)
-        _broadcast_new_work_to_miners()
+        _publish_event({
+            'timestamp': now,
+            'message': f'Block #{block.height} from {block.miner_id} is stale/rejected',
+            'type': 'block_stale',
+            'block': _block_to_dict(block, False)
+        })
 
 
-def _pruning_loop() -> None:
+def _pruning_loop(stop_event: threading.Event) -> None:
     """
     Background thread that periodically prunes old fork branches and adjusts difficulty if mining is too slow.
-    Runs every 5 seconds while simulation is active.
+    Runs every 5 seconds until stop_event is set, and exits as soon as it is.
+    
+    Args:
+        stop_event: Event set by stop/reset to end this thread
     """
-    global _pruning_active, _blockchain, _difficulty_controller, _miners
+    global _forks_dirty, _blockchain, _difficulty_controller, _miners
     
     last_block_height = 0
-    time_at_last_block = time.time()
+    # Interval math uses the monotonic clock; wall time is only for events
+    time_at_last_block = time.monotonic()
     
-    while _pruning_active:
+    # Wait out each interval on the event so stopping doesn't lag by up to 5s
+    while not stop_event.wait(_PRUNING_INTERVAL):
         try:
-            time.sleep(5)  # Check every 5 seconds
-            
-            if _blockchain and _simulation_running:
-                with _simulation_lock:
-                    # Prune branches that are more than 10 blocks behind main tip
-                    pruned_count = _blockchain.prune_old_branches(max_depth_behind=10)
-                    
-                    if pruned_count > 0:
-                        print(f"[PRUNING] Removed {pruned_count} old fork block(s)")
-                        
-                        # Optionally notify UI about pruning
-                        if _ui_callback:
-                            try:
-                                _ui_callback({
-                                    'timestamp': time.time(),
-                                    'message': f'Pruned {pruned_count} old fork block(s)',
-                                    'type': 'pruning',
-                                    'blocks_pruned': pruned_count
-                                })
-                            except Exception:
-                                pass
+            # One read per pass: a reset can set the global to None at any time
+            blockchain = _blockchain
+            if blockchain and _simulation_running:
+                # Skip pruning (and the lock) entirely while no side branches exist
+                pruned_count = 0
+                if _forks_dirty:
+                    with _simulation_lock:
+                        if _blockchain is blockchain:
+                            # Prune branches that are more than 10 blocks behind main tip
+                            pruned_count = blockchain.prune_old_branches(max_depth_behind=10)
+                            # Stay dirty while fork blocks remain; they may age out later
+                            _forks_dirty = blockchain.get_fork_block_count() > 0
                     
-                    # Check if difficulty should be decreased due to timeout
-                    current_height = _blockchain.get_block_count()
-                    current_time = time.time()
+                if pruned_count > 0:
+                    print(f"[PRUNING] Removed {pruned_count} old fork block(s)")
                     
-                    if current_height > last_block_height:
-                        # New block mined, reset timer
-                        last_block_height = current_height
-                        time_at_last_block = current_time
-                    else:
-                        # No new block, check if we've waited too long
-                        time_since_last_block = current_time - time_at_last_block
-                        
-                        # If no block for 15 seconds, decrease difficulty by 1
-                        if time_since_last_block > 15 and _difficulty_controller:
-                            current_diff = _difficulty_controller.get_current_difficulty()
-                            if current_diff > 1:
-                                new_difficulty = current_diff - 1  # Drop by exactly 1
-                                _difficulty_controller.current_difficulty = new_difficulty
-                                _blockchain.set_difficulty(new_difficulty)
-                                
-                                # Update miners' difficulty
-                                for miner in _miners:
-                                    miner.difficulty = new_difficulty
-                                
-                                # Broadcast new work with updated difficulty
-                                _broadcast_new_work_to_miners()
-                                
-                                print(f"[TIMEOUT] No block for {time_since_last_block:.1f}s, decreasing difficulty to {new_difficulty}")
-                                
-                                # Notify UI
-                                if _event_queue:
-                                    _event_queue.put({
-                                        'timestamp': time.time(),
-                                        'message': f'Difficulty decreased to {new_difficulty} due to timeout',
-                                        'type': 'difficulty_update',
-                                        'difficulty': new_difficulty
-                                    })
-                                
-                                # Reset timer after adjustment
-                                time_at_last_block = current_time
+                    # Notify UI about pruning
+                    _publish_event({
+                        'timestamp': time.time(),
+                        'message': f'Pruned {pruned_count} old fork block(s)',
+                        'type': 'pruning',
+                        'blocks_pruned': pruned_count
+                    })
+                
+                # Check if difficulty should be decreased due to timeout
+                # (Blockchain guards its own state, so no simulation lock needed here)
+                current_height = blockchain.get_block_count()
+                current_time = time.monotonic()
+                
+                if current_height > last_block_height:
+                    # New block mined, reset timer
+                    last_block_height = current_height
+                    time_at_last_block = current_time
+                    continue
+                
+                # No new block, check if we've waited too long
+                time_since_last_block = current_time - time_at_last_block
+                
+                # If no block for 15 seconds, decrease difficulty by 1
+                if time_since_last_block > 15 and _difficulty_controller:
+                    with _simulation_lock:
+                        if not _simulation_running or _blockchain is not blockchain:
+                            continue
+                        current_diff = _difficulty_controller.get_current_difficulty()
+                        if current_diff > 1:
+                            new_difficulty = current_diff - 1  # Drop by exactly 1
+                            _difficulty_controller.current_difficulty = new_difficulty
+                            blockchain.set_difficulty(new_difficulty)
+                            
+                            # Broadcast new work with updated difficulty
+                            _broadcast_new_work_to_miners(blockchain, _work_board)
+                            
+                            print(f"[TIMEOUT] No block for {time_since_last_block:.1f}s, decreasing difficulty to {new_difficulty}")
+                            
+                            # Notify UI
+                            _publish_event({
+                                'timestamp': time.time(),
+                                'message': f'Difficulty decreased to {new_difficulty} due to timeout',
+                                'type': 'difficulty_update',
+                                'difficulty': new_difficulty
+                            })
+                            
+                            # Reset timer after adjustment
+                            time_at_last_block = current_time
                                 
         except Exception as e:
             print(f"[PRUNING ERROR] {e}")
@@ -0,0 +1,106 @@
+"""
+Tests for the modulo hash and the closed-form nonce search.
+"""
+
+import random
+
+import pytest
+
+from utils.hash_utils import (
+    HASH_SPACE,
+    _NONCE_WEIGHT,
+    _TIMESTAMP_WEIGHT,
+    block_hash_prefix,
+    compute_block_hash,
+    difficulty_threshold,
+    find_nonce_from_prefix,
+)
+
+DIFFICULTIES = range(9)
+TIMESTAMP = 1700000000.123
+
+
+def scan_nonces(prefix, timestamp, difficulty, start_nonce, attempts):
+    """Reference search: hash every nonce in turn, wrapping at 2**32."""
+    base = prefix + int(timestamp * 1000) * _TIMESTAMP_WEIGHT
+    threshold = difficulty_threshold(difficulty)
+    nonce = start_nonce & 0xFFFFFFFF
+    for _ in range(attempts):
+        h = abs(base + nonce * _NONCE_WEIGHT) % HASH_SPACE
+        if h < threshold:
+            return nonce, h
+        nonce = (nonce + 1) & 0xFFFFFFFF
+    return None
+
+
+def prefix_for_value(value, timestamp, nonce):
+    """Prefix whose combined value at `nonce` equals `value`."""
+    return value - int(timestamp * 1000) * _TIMESTAMP_WEIGHT - nonce * _NONCE_WEIGHT
+
+
+def assert_matches_scan(prefix, timestamp, difficulty, start_nonce, attempts):
+    expected = scan_nonces(prefix, timestamp, difficulty, start_nonce, attempts)
+    assert find_nonce_from_prefix(prefix, timestamp, difficulty, start_nonce, attempts) == expected
+
+
+def test_prefix_agrees_with_compute_block_hash():
+    prefix = block_hash_prefix("1234567", 42, "Hello Blockchain!", "miner_1")
+    result = find_nonce_from_prefix(prefix, TIMESTAMP, 0, 99, 1)
+    assert result == (99, compute_block_hash("1234567", 42, TIMESTAMP, "Hello Blockchain!", 99, "miner_1"))
+
+
+@pytest.mark.parametrize("difficulty", DIFFICULTIES)
+def test_random_prefixes(difficulty):
+    rng = random.Random(difficulty)
+    for _ in range(200):
+        prefix = rng.randint(-2**64, 2**64)
+        start = rng.randint(0, 2**32 - 1)
+        assert_matches_scan(prefix, TIMESTAMP, difficulty, start, rng.randint(1, 3000))
+
+
+@pytest.mark.parametrize("difficulty", DIFFICULTIES)
+def test_negative_combined_values(difficulty):
+    rng = random.Random(100 + difficulty)
+    for _ in range(200):
+        start = rng.randint(0, 2**32 - 1)
+        attempts = rng.randint(1, 3000)
+        # Stays negative for the whole run
+        value = -rng.randint(attempts * _NONCE_WEIGHT, 2**40)
+        assert_matches_scan(prefix_for_value(value, TIMESTAMP, start), TIMESTAMP, difficulty, start, attempts)
+
+
+@pytest.mark.parametrize("difficulty", DIFFICULTIES)
+def test_runs_crossing_zero(difficulty):
+    rng = random.Random(200 + difficulty)
+    for _ in range(200):
+        start = rng.randint(0, 2**32 - 1)
+        attempts = rng.randint(2, 3000)
+        # Turns non-negative partway through the run
+        value = -rng.randint(0, (attempts - 1) * _NONCE_WEIGHT)
+        assert_matches_scan(prefix_for_value(value, TIMESTAMP, start), TIMESTAMP, difficulty, start, attempts)
+
+
+@pytest.mark.parametrize("difficulty", DIFFICULTIES)
+def test_starts_near_nonce_wrap(difficulty):
+    rng = random.Random(300 + difficulty)
+    for _ in range(200):
+        start = 2**32 - rng.randint(1, 3000)
+        attempts = rng.randint(1, 3000)
+        prefix = rng.randint(-2**64, 2**64)
+        assert_matches_scan(prefix, TIMESTAMP, difficulty, start, attempts)
+
+
+@pytest.mark.parametrize("difficulty", DIFFICULTIES)
+def test_finds_planted_hits(difficulty):
+    # Plant a hash of 0 (valid at every difficulty) inside the run, with and
+    # without a sign change or nonce wrap before it
+    rng = random.Random(400 + difficulty)
+    for _ in range(200):
+        start = rng.choice([rng.randint(0, 2**32 - 1), 2**32 - rng.randint(1, 50)])
+        offset = rng.randint(0, 99)
+        hit = (start + offset) & 0xFFFFFFFF
+        value = rng.choice([0, HASH_SPACE * rng.randint(1, 1000), -HASH_SPACE * rng.randint(1, 1000)])
+        prefix = prefix_for_value(value, TIMESTAMP, hit)
+        result = find_nonce_from_prefix(prefix, TIMESTAMP, difficulty, start, 100)
+        assert result == scan_nonces(prefix, TIMESTAMP, difficulty, start, 100)
+        assert result is not None and result[0] in {(start + i) & 0xFFFFFFFF for i in range(offset + 1)}
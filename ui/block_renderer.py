@@ -4,23 +4,79 @@ Provides HTML rendering for blockchain blocks as horizontal cards.
 """
 
 from typing import List, Dict, Any
-from datetime import datetime
+import time
+from functools import lru_cache
 import html
 
 def short_hash(hash_value: Any, length: int = 8) -> str:
-    """Shorten a hash for display."""
+    """Shorten a hash for display (uncached; only called from the memoized _render_card)."""
     hash_str = str(hash_value)
     if len(hash_str) > length:
         return hash_str[:length] + "..."
     return hash_str
 
-def render_blocks(blocks: List[Dict[str, Any]]) -> str:
+# Card styling, emitted once per strip instead of inline on every element
+_STYLE_BLOCK = """<style>
+.bpow-strip{display:flex;overflow-x:auto;gap:12px;padding:15px;background:linear-gradient(135deg,#667eea 0%,#764ba2 100%);border-radius:12px;margin:10px 0;box-shadow:inset 0 2px 10px rgba(0,0,0,0.2);}
+.bpow-card{min-width:220px;max-width:220px;padding:16px;border:3px solid;border-radius:12px;box-shadow:0 4px 8px rgba(0,0,0,0.15),0 1px 3px rgba(0,0,0,0.1);font-family:Segoe UI,Tahoma,sans-serif;font-size:12px;}
+.bpow-accepted{border-color:#28a745;background:linear-gradient(145deg,#d4edda,#c3e6cb);color:#155724;}
+.bpow-stale{border-color:#dc3545;background:linear-gradient(145deg,#f8d7da,#f1b0b7);color:#721c24;}
+.bpow-more{min-width:120px;padding:16px;align-self:center;text-align:center;color:#fff;font-family:Segoe UI,Tahoma,sans-serif;font-size:12px;opacity:0.8;}
+.bpow-title{font-weight:bold;margin-bottom:8px;font-size:14px;}
+.bpow-field{margin-bottom:6px;}
+.bpow-row{margin-bottom:4px;}
+.bpow-time{margin-bottom:8px;}
+.bpow-hash{background:#fff;padding:3px 6px;border-radius:4px;color:#000;font-family:Courier New,monospace;font-size:11px;display:inline-block;margin-top:2px;}
+.bpow-status{text-align:center;margin-top:8px;padding:4px;font-weight:bold;border-top:1px solid;}
+.bpow-accepted .bpow-status{border-top-color:#28a745;}
+.bpow-stale .bpow-status{border-top-color:#dc3545;}
+</style>"""
+
+def _html_text(value: Any) -> str:
+    """Convert a block field to HTML-safe text (ints need no escaping)."""
+    if type(value) is int:
+        return str(value)
+    return html.escape(str(value))
+
+# Strip container around the block cards
+_CONTAINER_OPEN = '<div class="bpow-strip">'
+_CONTAINER_CLOSE = '</div>'
+
+# Card template; holes are (status class, height, hash, prev hash, nonce, miner, time, status text)
+_CARD_TMPL = """
+<div class="bpow-card %s">
+<div class="bpow-title">Block #%s</div>
+<div class="bpow-field"><strong>Hash:</strong><br><span class="bpow-hash">%s</span></div>
+<div class="bpow-field"><strong>Prev:</strong><br><span class="bpow-hash">%s</span></div>
+<div class="bpow-row"><strong>Nonce:</strong> %s</div>
+<div class="bpow-row"><strong>Miner:</strong> %s</div>
+<div class="bpow-time"><strong>Time:</strong> %s</div>
+<div class="bpow-status">%s</div>
+</div>
+"""
+
+# Status-specialized card templates; holes are (height, hash, prev hash, nonce, miner, time)
+_FIELD_HOLES = ("%s",) * 6
+_ACCEPTED_TMPL = _CARD_TMPL % (("bpow-accepted",) + _FIELD_HOLES + ("✅ Accepted",))
+_STALE_TMPL = _CARD_TMPL % (("bpow-stale",) + _FIELD_HOLES + ("❌ Stale",))
+
+# Placeholder card for blocks cut off by the render window
+_MORE_TMPL = '<div class="bpow-more">... %d earlier block%s ...</div>'
+
+def render_blocks(blocks: List[Dict[str, Any]], max_blocks: int = 50,
+                  show_ellipsis: bool = True) -> str:
     """
     Render a horizontal strip of block cards as HTML.
     
+    Only the newest max_blocks blocks are rendered. Blocks don't change once
+    mined, so each card's HTML is memoized and a repaint only formats cards
+    it hasn't seen before.
+    
     Args:
         blocks: List of block dictionaries with fields:
                 height, hash, prev_hash, nonce, miner_id, timestamp, accepted
+        max_blocks: Maximum number of (most recent) blocks to render
+        show_ellipsis: Whether to lead with a card counting the hidden blocks
     
     Returns:
         HTML string for rendering block cards
@@ -28,62 +84,51 @@ def render_blocks(blocks: List[Dict[str, Any]]) -> str:
     if not blocks:
         return '<p style="text-align: center; color: #666; padding: 20px;">No blocks to display</p>'
     
-    # Start container
-    html_output = '<div style="display: flex; overflow-x: auto; gap: 12px; padding: 15px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 12px; margin: 10px 0; box-shadow: inset 0 2px 10px rgba(0,0,0,0.2);">'
-    
-    for block in blocks:
-        # Determine block status styling
-        accepted = block.get('accepted', True)
-        
-        if accepted:
-            border_color = "#28a745"
-            status_text = "✅ Accepted"
-            bg_color = "#d4edda"
-            bg_gradient = "#c3e6cb"
-            text_color = "#155724"
-        else:
-            border_color = "#dc3545"
-            status_text = "❌ Stale"
-            bg_color = "#f8d7da"
-            bg_gradient = "#f1b0b7"
-            text_color = "#721c24"
-        
-        # Format timestamp
-        timestamp = block.get('timestamp', 0)
-        if isinstance(timestamp, (int, float)) and timestamp > 0:
-            try:
-                dt = datetime.fromtimestamp(timestamp)
-                time_str = dt.strftime("%H:%M:%S")
-            except (ValueError, OSError):
-                time_str = "Invalid"
-        else:
-            time_str = "N/A"
-        
-        # Get and escape values
-        height = html.escape(str(block.get('height', '?')))
-        block_hash = html.escape(str(block.get('hash', 'N/A')))
-        prev_hash = html.escape(str(block.get('prev_hash', 'N/A')))
-        nonce = html.escape(str(block.get('nonce', 'N/A')))
-        miner_id = html.escape(str(block.get('miner_id', 'N/A')))
-        
-        # Shorten hashes
-        short_block_hash = short_hash(block_hash, 12)
-        short_prev_hash = short_hash(prev_hash, 8)
-        
-        # Build block card
-        html_output += f'''
-<div style="min-width: 220px; max-width: 220px; padding: 16px; border: 3px solid {border_color}; border-radius: 12px; background: linear-gradient(145deg, {bg_color}, {bg_gradient}); box-shadow: 0 4px 8px rgba(0,0,0,0.15), 0 1px 3px rgba(0,0,0,0.1); font-family: Segoe UI, Tahoma, sans-serif; font-size: 12px; color: {text_color};">
-<div style="font-weight: bold; margin-bottom: 8px; font-size: 14px;">Block #{height}</div>
-<div style="margin-bottom: 6px;"><strong>Hash:</strong><br><span style="background: #fff; padding: 3px 6px; border-radius: 4px; color: #000; font-family: Courier New, monospace; font-size: 11px; display: inline-block; margin-top: 2px;">{short_block_hash}</span></div>
-<div style="margin-bottom: 6px;"><strong>Prev:</strong><br><span style="background: #fff; padding: 3px 6px; border-radius: 4px; color: #000; font-family: Courier New, monospace; font-size: 11px; display: inline-block; margin-top: 2px;">{short_prev_hash}</span></div>
-<div style="margin-bottom: 4px;"><strong>Nonce:</strong> {nonce}</div>
-<div style="margin-bottom: 4px;"><strong>Miner:</strong> {miner_id}</div>
-<div style="margin-bottom: 8px;"><strong>Time:</strong> {time_str}</div>
-<div style="text-align: center; margin-top: 8px; padding: 4px; font-weight: bold; border-top: 1px solid {border_color};">{status_text}</div>
-</div>
-'''
+    # Slice from the front: blocks[-0:] would keep everything
+    hidden = min(max(len(blocks) - max_blocks, 0), len(blocks))
+    if hidden:
+        blocks = blocks[hidden:]
     
-    # Close container
-    html_output += '</div>'
+    cards = "".join(
+        _render_card(
+            block.get('height', '?'),
+            block.get('hash', 'N/A'),
+            block.get('prev_hash', 'N/A'),
+            block.get('nonce', 'N/A'),
+            block.get('miner_id', 'N/A'),
+            block.get('timestamp', 0),
+            block.get('accepted', True),
+        )
+        for block in blocks
+    )
+    if hidden and show_ellipsis:
+        cards = _MORE_TMPL % (hidden, "" if hidden == 1 else "s") + cards
+    return _STYLE_BLOCK + _CONTAINER_OPEN + cards + _CONTAINER_CLOSE
+
+@lru_cache(maxsize=4096)
+def _render_card(height: Any, block_hash: Any, prev_hash: Any, nonce: Any,
+                 miner_id: Any, timestamp: Any, accepted: bool) -> str:
+    """Render the HTML card for a single block (memoized on its fields)."""
+    # Format timestamp
+    if isinstance(timestamp, (int, float)) and timestamp > 0:
+        try:
+            time_str = _clock_time(int(timestamp))
+        except (ValueError, OSError, OverflowError):
+            time_str = "Invalid"
+    else:
+        time_str = "N/A"
     
-    return html_output
\ No newline at end of file
+    # Escape values; hashes are shortened after escaping
+    return (_ACCEPTED_TMPL if accepted else _STALE_TMPL) % (
+        _html_text(height),
+        short_hash(_html_text(block_hash), 12),
+        short_hash(_html_text(prev_hash), 8),
+        _html_text(nonce),
+        _html_text(miner_id),
+        time_str,
+    )
+
+@lru_cache(maxsize=4096)
+def _clock_time(second: int) -> str:
+    """Format a Unix second as HH:MM:SS (cached; bursts of blocks share seconds)."""
+    return time.strftime("%H:%M:%S", time.localtime(second))
@@ -4,7 +4,10 @@ Provides common utility functions used across UI components.
 """
 
 from typing import Union
+from functools import lru_cache
+import html
 
+@lru_cache(maxsize=8192)
 def short_hash(h: Union[str, int], length: int = 8) -> str:
     """
     Truncate a hash to a shorter representation.
@@ -26,3 +29,41 @@ def short_hash(h: Union[str, int], length: int = 8) -> str:
         return h_str
     
     return f"{h_str[:length]}..."
+
+@lru_cache(maxsize=4096)
+def escape_html(text: str) -> str:
+    """
+    Escape text for interpolation into HTML.
+    
+    Memoized, since miner IDs, event types and messages recur constantly
+    across re-renders.
+    
+    Args:
+        text: Text to escape
+    
+    Returns:
+        Text with &, <, >, and quotes escaped
+    """
+    return html.escape(text)
+
+def clear_render_caches() -> None:
+    """
+    Drop all memoized UI rendering results (cards, times, hashes, escapes).
+    
+    The caches are bounded, but a reset makes everything in them stale, so
+    the UI clears them along with the blockchain.
+    """
+    # Imported here: the renderers themselves import this module
+    from ui import block_renderer, logs, render_helpers
+    
+    for cached in (
+        short_hash,
+        escape_html,
+        block_renderer._render_card,
+        block_renderer._clock_time,
+        logs._format_log_time,
+        render_helpers._format_clock,
+        render_helpers._render_block_card_cached,
+    ):
+        cached.cache_clear()
+    render_helpers._last_chain = (None, "")
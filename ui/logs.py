@@ -5,6 +5,65 @@ Provides formatted log display for mining events and simulation activities.
 
 from typing import List, Dict, Any
 from datetime import datetime
+from functools import lru_cache
+import heapq
+from ui.helpers import escape_html
+
+@lru_cache(maxsize=8192)
+def _format_log_time(millis: int) -> str:
+    """Format a Unix time in whole milliseconds as HH:MM:SS.mmm (cached)."""
+    seconds, ms = divmod(millis, 1000)
+    return f"{datetime.fromtimestamp(seconds).strftime('%H:%M:%S')}.{ms:03d}"
+
+# (color, icon) per event type; anything else gets _DEFAULT_STYLE
+_EVENT_STYLE = {
+    'block_found': ("#00ff00", "⛏️"),  # Green
+    'block_accepted': ("#00ff00", "✅"),  # Green
+    'simulation_start': ("#00bfff", "🚀"),  # Blue
+    'simulation_stop': ("#ff6b6b", "⏹️"),  # Red
+    'miner_status': ("#ffd700", "⚡"),  # Gold
+    'difficulty_adjusted': ("#ff8c00", "📊"),  # Orange
+    'data_submission': ("#9370db", "📤"),  # Purple
+}
+_DEFAULT_STYLE = ("#ffffff", "ℹ️")  # White
+
+_LOG_OPEN = """
+        <div style="
+            background-color: #1e1e1e; 
+            color: #ffffff; 
+            padding: 15px; 
+            border-radius: 8px; 
+            font-family: 'Courier New', monospace; 
+            font-size: 12px; 
+            max-height: 400px; 
+            overflow-y: auto;
+            border: 1px solid #333;
+        ">
+        """
+
+# Holes are (time, color, icon, event type, message)
+_LOG_ENTRY_TMPL = """
+        <div style="margin-bottom: 8px; padding: 4px 0; border-bottom: 1px solid #333;">
+            <span style="color: #888;">[%s]</span>
+            <span style="color: %s; font-weight: bold;">%s %s</span>
+            <span style="color: #ffffff;">%s</span>
+        """
+
+# Detail text per event type, as pre-bound str.format calls
+_BLOCK_FOUND_DETAIL = "Block #{} | Hash: {}... | Miner: {}".format
+_MINER_STATUS_DETAIL = "{}: {:,.0f} H/s".format
+_DIFFICULTY_DETAIL = "{} → {}".format
+
+# Extra detail line under an entry; the hole is the detail text
+_LOG_DETAIL_TMPL = """
+            <div style="margin-left: 20px; color: #ccc; font-size: 11px;">
+                %s
+            </div>
+            """
+
+def _event_time(event: Dict[str, Any]) -> Any:
+    """Sort key for events (missing timestamps sort as oldest)."""
+    return event.get('timestamp', 0)
 
 def render_logs(events: List[Dict[str, Any]], limit: int = 200) -> str:
     """
@@ -24,105 +83,52 @@ def render_logs(events: List[Dict[str, Any]], limit: int = 200) -> str:
         </div>
         """
     
-    # Sort events by timestamp (most recent first)
-    sorted_events = sorted(events, key=lambda x: x.get('timestamp', 0), reverse=True)
-    
-    # Limit the number of events
-    recent_events = sorted_events[:limit]
+    # Most recent `limit` events first; nlargest only keeps a heap of `limit`
+    # entries (same result and tie order as sorted(..., reverse=True)[:limit])
+    recent_events = heapq.nlargest(limit, events, key=_event_time)
     
-    html_parts = [
-        """
-        <div style="
-            background-color: #1e1e1e; 
-            color: #ffffff; 
-            padding: 15px; 
-            border-radius: 8px; 
-            font-family: 'Courier New', monospace; 
-            font-size: 12px; 
-            max-height: 400px; 
-            overflow-y: auto;
-            border: 1px solid #333;
-        ">
-        """
-    ]
+    html_parts = [_LOG_OPEN]
     
+    esc = escape_html
     for event in recent_events:
         timestamp = event.get('timestamp', 0)
         
         # Format timestamp
         if isinstance(timestamp, (int, float)):
             try:
-                dt = datetime.fromtimestamp(timestamp)
-                time_str = dt.strftime("%H:%M:%S.%f")[:-3]  # Include milliseconds
-            except (ValueError, OSError):
+                time_str = _format_log_time(int(timestamp * 1000))  # Include milliseconds
+            except (ValueError, OSError, OverflowError):
                 time_str = "Invalid"
         else:
-            time_str = str(timestamp)
+            time_str = esc(str(timestamp))
         
         event_type = event.get('type', 'unknown')
         message = event.get('message', '')
         
         # Color coding based on event type
-        if event_type == 'block_found':
-            color = "#00ff00"  # Green
-            icon = "⛏️"
-        elif event_type == 'block_accepted':
-            color = "#00ff00"  # Green
-            icon = "✅"
-        elif event_type == 'simulation_start':
-            color = "#00bfff"  # Blue
-            icon = "🚀"
-        elif event_type == 'simulation_stop':
-            color = "#ff6b6b"  # Red
-            icon = "⏹️"
-        elif event_type == 'miner_status':
-            color = "#ffd700"  # Gold
-            icon = "⚡"
-        elif event_type == 'difficulty_adjusted':
-            color = "#ff8c00"  # Orange
-            icon = "📊"
-        elif event_type == 'data_submission':
-            color = "#9370db"  # Purple
-            icon = "📤"
-        else:
-            color = "#ffffff"  # White
-            icon = "ℹ️"
+        color, icon = _EVENT_STYLE.get(event_type, _DEFAULT_STYLE)
         
         # Create log entry
-        log_entry = f"""
-        <div style="margin-bottom: 8px; padding: 4px 0; border-bottom: 1px solid #333;">
-            <span style="color: #888;">[{time_str}]</span>
-            <span style="color: {color}; font-weight: bold;">{icon} {event_type.upper()}</span>
-            <span style="color: #ffffff;">{message}</span>
-        """
+        html_parts.append(_LOG_ENTRY_TMPL % (time_str, color, icon, esc(str(event_type).upper()), esc(str(message))))
         
         # Add additional details for specific event types
         if event_type == 'block_found' and 'block' in event:
             block = event['block']
-            log_entry += f"""
-            <div style="margin-left: 20px; color: #ccc; font-size: 11px;">
-                Block #{block.get('height', '?')} | Hash: {block.get('hash', 'N/A')[:16]}... | Miner: {block.get('miner_id', 'N/A')}
-            </div>
-            """
+            html_parts.append(_LOG_DETAIL_TMPL % _BLOCK_FOUND_DETAIL(
+                esc(str(block.get('height', '?'))),
+                esc(str(block.get('hash', 'N/A'))[:16]),
+                esc(str(block.get('miner_id', 'N/A'))),
+            ))
         elif event_type == 'miner_status':
             miner_id = event.get('miner_id', 'N/A')
             hashrate = event.get('hashrate', 0)
-            log_entry += f"""
-            <div style="margin-left: 20px; color: #ccc; font-size: 11px;">
-                {miner_id}: {hashrate:,.0f} H/s
-            </div>
-            """
+            html_parts.append(_LOG_DETAIL_TMPL % _MINER_STATUS_DETAIL(esc(str(miner_id)), hashrate))
         elif event_type == 'difficulty_adjusted':
             old_diff = event.get('old_difficulty', 'N/A')
             new_diff = event.get('new_difficulty', 'N/A')
-            log_entry += f"""
-            <div style="margin-left: 20px; color: #ccc; font-size: 11px;">
-                {old_diff} → {new_diff}
-            </div>
-            """
+            html_parts.append(_LOG_DETAIL_TMPL % _DIFFICULTY_DETAIL(esc(str(old_diff)), esc(str(new_diff))))
         
-        log_entry += "</div>"
-        html_parts.append(log_entry)
+        html_parts.append("</div>")
     
     html_parts.append("</div>")
     
@@ -3,8 +3,15 @@ UI rendering helper functions for blockchain visualization.
 Provides HTML rendering functions for blocks, blockchain, and mining logs.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from datetime import datetime
+from functools import lru_cache
+from ui.helpers import short_hash, escape_html
+
+@lru_cache(maxsize=8192)
+def _format_clock(seconds: int) -> str:
+    """Format a Unix time in whole seconds as HH:MM:SS (cached)."""
+    return datetime.fromtimestamp(seconds).strftime('%H:%M:%S')
 
 def render_block_card(block: Dict[str, Any]) -> str:
     """
@@ -17,71 +24,74 @@ def render_block_card(block: Dict[str, Any]) -> str:
         HTML string for the block card
     """
     # Extract block data with defaults
-    height = block.get('height', '?')
-    block_hash = block.get('hash', 'N/A')
-    prev_hash = block.get('prev_hash', 'N/A')
-    nonce = block.get('nonce', 'N/A')
-    miner_id = block.get('miner_id', 'N/A')
-    timestamp = block.get('timestamp', 0)
-    accepted = block.get('accepted', False)
-    
+    return _render_block_card_cached(
+        block.get('height', '?'),
+        block.get('hash', 'N/A'),
+        block.get('prev_hash', 'N/A'),
+        block.get('nonce', 'N/A'),
+        block.get('miner_id', 'N/A'),
+        block.get('timestamp', 0),
+        block.get('accepted', False),
+    )
+
+# Card styles, emitted once per chain by render_block_chain. Rules are scoped
+# to .block-chain so they win over the generic .block-card styles in app.py.
+_BLOCK_CHAIN_CSS = """<style>
+.block-chain{display:flex;flex-wrap:wrap;gap:10px;padding:10px;background-color:#f8f9fa;border-radius:8px;border:1px solid #dee2e6;max-height:600px;overflow-y:auto;}
+.block-chain .block-card{border:2px solid;border-radius:8px;padding:10px;margin:5px;display:inline-block;min-width:200px;vertical-align:top;}
+.block-chain .block-card.accepted{border-color:#28a745;background-color:#d4edda;color:#155724;}
+.block-chain .block-card.stale{border-color:#dc3545;background-color:#f8d7da;color:#721c24;}
+.block-chain .bc-title{font-weight:bold;font-size:14px;margin-bottom:8px;}
+.block-chain .bc-row{font-size:11px;margin:2px 0;}
+</style>"""
+
+# Holes are (status class, height, hash, prev hash, nonce, miner, time, status text)
+_BLOCK_CARD_TMPL = """
+    <div class="block-card %s">
+        <div class="bc-title">Block #%s</div>
+        <div class="bc-row"><strong>Hash:</strong> %s</div>
+        <div class="bc-row"><strong>Prev:</strong> %s</div>
+        <div class="bc-row"><strong>Nonce:</strong> %s</div>
+        <div class="bc-row"><strong>Miner:</strong> %s</div>
+        <div class="bc-row"><strong>Time:</strong> %s</div>
+        <div class="bc-row"><strong>Status:</strong> %s</div>
+    </div>
+    """
+
+@lru_cache(maxsize=4096)
+def _render_block_card_cached(height: Any, block_hash: Any, prev_hash: Any, nonce: Any,
+                              miner_id: Any, timestamp: Any, accepted: bool) -> str:
+    """Render a block card from its fields (memoized; blocks don't change once mined)."""
     # Format timestamp
     try:
-        dt = datetime.fromtimestamp(timestamp)
-        time_str = dt.strftime('%H:%M:%S')
-    except:
+        time_str = _format_clock(int(timestamp))
+    except (TypeError, ValueError, OSError, OverflowError):
         time_str = 'N/A'
     
-# Determine card class and colors based on status
-    if accepted:
-        card_class = "block-card accepted"
-        bg_color = "#d4edda"
-        border_color = "#28a745"
-        text_color = "#155724"
-    else:
-        card_class = "block-card stale"
-        bg_color = "#f8d7da"
-        border_color = "#dc3545"
-        text_color = "#721c24"
-    
-    # Shorten hashes for display (convert to string if integer)
-    block_hash_str = str(block_hash)
-    prev_hash_str = str(prev_hash)
-    short_hash = block_hash_str[:8] + "..." if len(block_hash_str) > 8 else block_hash_str
-    short_prev_hash = prev_hash_str[:8] + "..." if len(prev_hash_str) > 8 else prev_hash_str
-    
-    html = f"""
-    <div class="{card_class}" style="border: 2px solid {border_color}; border-radius: 8px; padding: 10px; margin: 5px; background-color: {bg_color}; display: inline-block; min-width: 200px; vertical-align: top; color: {text_color};">
-        <div style="font-weight: bold; font-size: 14px; margin-bottom: 8px; color: {text_color};">
-            Block #{height}
-        </div>
-        <div style="font-size: 11px; margin: 2px 0; color: {text_color};">
-            <strong>Hash:</strong> {short_hash}
-        </div>
-        <div style="font-size: 11px; margin: 2px 0; color: {text_color};">
-            <strong>Prev:</strong> {short_prev_hash}
-        </div>
-        <div style="font-size: 11px; margin: 2px 0; color: {text_color};">
-            <strong>Nonce:</strong> {nonce}
-        </div>
-        <div style="font-size: 11px; margin: 2px 0; color: {text_color};">
-            <strong>Miner:</strong> {miner_id}
-        </div>
-        <div style="font-size: 11px; margin: 2px 0; color: {text_color};">
-            <strong>Time:</strong> {time_str}
-        </div>
-        <div style="font-size: 11px; margin: 2px 0; color: {text_color};">
-            <strong>Status:</strong> {'âœ… Accepted' if accepted else 'âŒ Stale'}
-</div>
-    </div>
-    """
-    
-    return html
+    esc = escape_html
+    return _BLOCK_CARD_TMPL % (
+        "accepted" if accepted else "stale",
+        esc(str(height)),
+        esc(short_hash(block_hash, 8)),
+        esc(short_hash(prev_hash, 8)),
+        esc(str(nonce)),
+        esc(str(miner_id)),
+        time_str,
+        '✅ Accepted' if accepted else '❌ Stale',
+    )
+
+# (fingerprint, html) of the last chain rendered, swapped in as one tuple so
+# concurrent sessions never pair one chain's fingerprint with another's HTML
+_last_chain: Tuple[Any, str] = (None, "")
 
 def render_block_chain(blocks: List[Dict[str, Any]]) -> str:
     """
     Render a list of blocks as a horizontal flow of cards with scrolling.
     
+    Card styling is emitted once as a <style> block ahead of the cards. A
+    chain is identified by its length and tip, so redrawing an unchanged
+    chain returns the previous HTML without touching the cards.
+    
     Args:
         blocks: List of block dictionaries
         
@@ -91,21 +101,44 @@ def render_block_chain(blocks: List[Dict[str, Any]]) -> str:
     if not blocks:
         return '<div style="text-align: center; color: #666; padding: 20px;">No blocks mined yet...</div>'
     
+    global _last_chain
+    
+    tip = blocks[-1]
+    fingerprint = (len(blocks), tip.get('hash'), tip.get('accepted'))
+    last_fingerprint, last_html = _last_chain
+    if fingerprint == last_fingerprint:
+        return last_html
+    
     # Render each block as a card
     block_cards = []
     for block in blocks:
         card_html = render_block_card(block)
         block_cards.append(card_html)
     
-# Wrap in a scrollable flexbox container
-    html = f"""
-    <div style="display: flex; flex-wrap: wrap; gap: 10px; padding: 10px; background-color: #f8f9fa; border-radius: 8px; border: 1px solid #dee2e6; max-height: 600px; overflow-y: auto;">
+    # Wrap in a scrollable flexbox container
+    html = f"""{_BLOCK_CHAIN_CSS}
+    <div class="block-chain">
 {''.join(block_cards)}
     </div>
     """
-    
+    _last_chain = (fingerprint, html)
     return html
 
+# (entry class, message formatter) per event type; formatters are pre-bound
+# format_map calls taking t (time), h (block height), m (miner), r (hash rate)
+_LOG_LINE_FMT = {
+    'block_found': ("log-entry block-found", "[{t}] Block #{h} found by {m}".format_map),
+    'block_accepted': ("log-entry block-accepted", "[{t}] Block #{h} accepted by network".format_map),
+    'block_stale': ("log-entry block-stale", "[{t}] Block #{h} became stale".format_map),
+    'miner_status': ("log-entry", "[{t}] {m} hash rate: {r} H/s".format_map),
+    'simulation_start': ("log-entry", "[{t}] Simulation started".format_map),
+    'simulation_stop': ("log-entry", "[{t}] Simulation stopped".format_map),
+}
+
+_UNKNOWN_LINE = "[{}] {}: {}...".format
+
+_LOG_ENTRY_HTML = '<div class="%s">%s</div>'
+
 def render_mining_log(events: List[Dict[str, Any]], max_lines: int = 200) -> str:
     """
     Render mining events as a log display.
@@ -124,57 +157,31 @@ def render_mining_log(events: List[Dict[str, Any]], max_lines: int = 200) -> str
     recent_events = events[-max_lines:] if len(events) > max_lines else events
     
     log_entries = []
+    append = log_entries.append
+    esc = escape_html
     for event in reversed(recent_events):  # Show newest first
         event_type = event.get('type', 'unknown')
         timestamp = event.get('timestamp', 0)
         
         # Format timestamp
         try:
-            dt = datetime.fromtimestamp(timestamp)
-            time_str = dt.strftime('%H:%M:%S')
-        except:
+            time_str = _format_clock(int(timestamp))
+        except (TypeError, ValueError, OSError, OverflowError):
             time_str = 'N/A'
         
-        # Create log entry based on event type
-        if event_type == 'block_found':
-            block = event.get('block', {})
-            miner_id = block.get('miner_id', 'Unknown')
-            height = block.get('height', '?')
-            entry_class = "log-entry block-found"
-            message = f"[{time_str}] Block #{height} found by {miner_id}"
-            
-        elif event_type == 'block_accepted':
-            block = event.get('block', {})
-            height = block.get('height', '?')
-            entry_class = "log-entry block-accepted"
-            message = f"[{time_str}] Block #{height} accepted by network"
-            
-        elif event_type == 'block_stale':
-            block = event.get('block', {})
-            height = block.get('height', '?')
-            entry_class = "log-entry block-stale"
-            message = f"[{time_str}] Block #{height} became stale"
-            
-        elif event_type == 'miner_status':
-            miner_id = event.get('miner_id', 'Unknown')
-            hashrate = event.get('hashrate', 0)
-            entry_class = "log-entry"
-            message = f"[{time_str}] {miner_id} hash rate: {hashrate} H/s"
-            
-        elif event_type == 'simulation_start':
-            entry_class = "log-entry"
-            message = f"[{time_str}] Simulation started"
-            
-        elif event_type == 'simulation_stop':
-            entry_class = "log-entry"
-            message = f"[{time_str}] Simulation stopped"
-            
-        else:
+        line = _LOG_LINE_FMT.get(event_type)
+        if line is None:
             # Handle unknown event types
-            entry_class = "log-entry"
-            message = f"[{time_str}] {event_type}: {str(event)[:100]}..."
+            append(_LOG_ENTRY_HTML % ("log-entry", _UNKNOWN_LINE(time_str, esc(str(event_type)), esc(str(event)[:100]))))
+            continue
         
-        log_entries.append(f'<div class="{entry_class}">{message}</div>')
+        entry_class, format_message = line
+        if event_type == 'miner_status':
+            context = {'t': time_str, 'm': esc(str(event.get('miner_id', 'Unknown'))), 'r': esc(str(event.get('hashrate', 0)))}
+        else:
+            block = event.get('block') or {}
+            context = {'t': time_str, 'h': esc(str(block.get('height', '?'))), 'm': esc(str(block.get('miner_id', 'Unknown')))}
+        append(_LOG_ENTRY_HTML % (entry_class, format_message(context)))
     
     # Combine all log entries
     html = f"""
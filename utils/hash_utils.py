@@ -3,7 +3,17 @@ Utility functions for hash computation and validation.
 Uses simple modulo hash for educational purposes.
 """
 
-import hashlib
+from typing import Optional, Tuple
+
+# Size of the modulo hash space (1 crore)
+HASH_SPACE = 10000000
+
+# Weights of the per-attempt components in the combined hash value
+_TIMESTAMP_WEIGHT = 6131
+_NONCE_WEIGHT = 3571
+
+# Hash threshold for each difficulty level 0-8 (see hash_meets_difficulty)
+_DIFFICULTY_THRESHOLDS = (10000000, 1000000, 100000, 10000, 1000, 100, 10, 5, 1)
 
 
 def compute_block_hash(prev_hash: str, height: int, timestamp: float, data: str, nonce: int, miner_id: str) -> int:
@@ -24,6 +34,34 @@ def compute_block_hash(prev_hash: str, height: int, timestamp: float, data: str,
     Returns:
         Integer hash value (0-9999999)
     """
+    # Combine all components
+    combined = (
+        block_hash_prefix(prev_hash, height, data, miner_id) +
+        int(timestamp * 1000) * _TIMESTAMP_WEIGHT +
+        nonce * _NONCE_WEIGHT
+    )
+    
+    # Take modulo 10000000 (1 crore) to get hash in range [0, 9999999]
+    return abs(combined) % HASH_SPACE
+
+
+def block_hash_prefix(prev_hash: str, height: int, data: str, miner_id: str) -> int:
+    """
+    Combine the block fields that stay fixed while a miner sweeps nonces.
+    
+    compute_block_hash adds the timestamp and nonce terms to this value, so a
+    miner can compute it once per unit of work and reuse it for every attempt
+    (see find_nonce_from_prefix).
+    
+    Args:
+        prev_hash: Hash of the previous block (int or string)
+        height: Block height
+        data: Block data
+        miner_id: ID of the miner
+    
+    Returns:
+        Partial combined value, before the timestamp and nonce terms
+    """
     # Convert prev_hash to int if it's a string
     if isinstance(prev_hash, str):
         # If it's a numeric string, convert it
@@ -35,19 +73,13 @@ def compute_block_hash(prev_hash: str, height: int, timestamp: float, data: str,
     else:
         prev_hash_int = int(prev_hash)
     
-    # Combine all components
     # Use Python's built-in hash for strings and multiply by prime numbers for better distribution
-    combined = (
+    return (
         prev_hash_int +
         height * 7919 +
-        int(timestamp * 1000) * 6131 +
         hash(data) * 4969 +
-        nonce * 3571 +
         hash(miner_id) * 2927
     )
-    
-    # Take modulo 10000000 (1 crore) to get hash in range [0, 9999999]
-    return abs(combined) % 10000000
 
 
 def hash_meets_difficulty(block_hash: int, difficulty: int) -> bool:
@@ -83,15 +115,101 @@ def hash_meets_difficulty(block_hash: int, difficulty: int) -> bool:
         except ValueError:
             return False
     
-    # Calculate threshold based on difficulty
-    # Each difficulty level divides threshold by 10
-    if difficulty == 0:
-        threshold = 10000000  # 100% - always valid
-    elif difficulty <= 6:
-        threshold = 10 ** (7 - difficulty)  # 10^6, 10^5, 10^4, 10^3, 10^2, 10^1
-    elif difficulty == 7:
-        threshold = 5  # Extra hard
-    else:  # difficulty 8
-        threshold = 1  # Maximum difficulty
-    
-    return block_hash < threshold
+    return block_hash < difficulty_threshold(difficulty)
+
+
+def difficulty_threshold(difficulty: int) -> int:
+    """
+    Get the hash threshold a block hash must be below for a difficulty.
+    
+    Levels 0-8 come from a precomputed table; each level divides the
+    threshold by 10 up to 6, then 7 and 8 are 5 and 1.
+    
+    Args:
+        difficulty: Difficulty level (0-8)
+    
+    Returns:
+        Exclusive upper bound for valid hashes
+    """
+    if difficulty > 8:
+        return 1  # Maximum difficulty
+    if difficulty < 0:
+        return 10 ** (7 - difficulty)
+    return _DIFFICULTY_THRESHOLDS[difficulty]
+
+
+def find_nonce_from_prefix(prefix: int, timestamp: float, difficulty: int,
+                           start_nonce: int, attempts: int) -> Optional[Tuple[int, int]]:
+    """
+    Search a range of nonces given a precomputed block_hash_prefix.
+    
+    This is the mining inner loop. Consecutive nonces step the combined value
+    by a constant, so over a run of nonces that neither wraps at 2**32 nor
+    changes the combined value's sign the hash is an arithmetic progression
+    mod HASH_SPACE. The first hash under the threshold in each run is solved
+    for directly, making a search O(log HASH_SPACE) instead of O(attempts);
+    the result is the same nonce a one-by-one scan would find.
+    
+    Args:
+        prefix: Value from block_hash_prefix for the block being mined
+        timestamp: Block timestamp
+        difficulty: Difficulty level (0-8)
+        start_nonce: First nonce to try
+        attempts: Number of consecutive nonces to try (wrapping at 2**32)
+    
+    Returns:
+        (nonce, hash) for the first valid nonce, or None if none was found
+    """
+    base = prefix + int(timestamp * 1000) * _TIMESTAMP_WEIGHT
+    threshold = difficulty_threshold(difficulty)
+    nonce = start_nonce & 0xFFFFFFFF
+    remaining = attempts
+    while remaining > 0:
+        run = min(remaining, 0x100000000 - nonce)
+        value = base + nonce * _NONCE_WEIGHT
+        if value < 0:
+            # abs() makes the hash step backwards until the value turns non-negative
+            run = min(run, -(value // _NONCE_WEIGHT))
+            offset = _first_hit(-value % HASH_SPACE, -_NONCE_WEIGHT % HASH_SPACE, threshold)
+        else:
+            offset = _first_hit(value % HASH_SPACE, _NONCE_WEIGHT % HASH_SPACE, threshold)
+        if offset is not None and offset < run:
+            nonce += offset
+            return nonce, abs(base + nonce * _NONCE_WEIGHT) % HASH_SPACE
+        nonce = (nonce + run) & 0xFFFFFFFF
+        remaining -= run
+    return None
+
+
+def _first_hit(start: int, step: int, threshold: int) -> Optional[int]:
+    """Smallest i >= 0 with (start + i*step) % HASH_SPACE < threshold, or None."""
+    if start < threshold:
+        return 0
+    # Shift so the target window [HASH_SPACE - start, ...] holds no wrap-around
+    low = HASH_SPACE - start
+    return _first_multiple_in(step, HASH_SPACE, low, low + threshold - 1)
+
+
+def _first_multiple_in(step: int, modulus: int, low: int, high: int) -> Optional[int]:
+    """
+    Smallest i >= 0 with low <= (i*step) % modulus <= high, or None.
+    
+    Requires 0 <= low <= high < modulus. Recurses on (modulus % step, step)
+    like Euclid's algorithm, so the depth is logarithmic in modulus.
+    """
+    if low == 0:
+        return 0
+    step %= modulus
+    if step == 0:
+        return None
+    # First multiple of step at or above low, before any wrap-around
+    i = -(-low // step)
+    if i * step <= high:
+        return i
+    # Otherwise the window is narrower than step and we need the fewest
+    # wrap-arounds y such that low + y*modulus .. high + y*modulus holds a
+    # multiple of step; that is the same problem with step and modulus swapped
+    wraps = _first_multiple_in(modulus % step, step, -high % step, -low % step)
+    if wraps is None:
+        return None
+    return -(-(low + wraps * modulus) // step)